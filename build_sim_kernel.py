@@ -0,0 +1,32 @@
+"""
+Ahead-of-time build of the native gate kernel.
+
+Running ``python build_sim_kernel.py`` compiles the gate pass of
+simulation_kernel.py into the ``sim_native`` extension module next to this
+script, so the simulator starts without paying Numba's JIT warmup. When the
+extension is missing, simulation_kernel falls back to JIT compilation (if
+Numba is installed) or to the NumPy gate groups.
+"""
+import os
+import sys
+
+from numba.pycc import CC
+
+from simulation_kernel import _settle_gates
+
+
+# signals, ops, invert, in_ptr, in_nets, out_nets, first, last, max_iterations
+SETTLE_GATES_SIGNATURE = "i8(u8[:], i1[:], u8[:], i4[:], i4[:], i4[:], i8, i8, i8)"
+
+
+def build(output_dir: str = None) -> str:
+    """Compile the sim_native extension; returns the directory it was written to."""
+    cc = CC("sim_native")
+    cc.output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    cc.export("settle_gates", SETTLE_GATES_SIGNATURE)(_settle_gates)
+    cc.compile()
+    return cc.output_dir
+
+
+if __name__ == "__main__":
+    print(f"Built sim_native in {build(sys.argv[1] if len(sys.argv) > 1 else None)}")
@@ -16,9 +16,9 @@ class SignalState(Enum):
     HIGHZ = SIGNAL_HIGHZ
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Signal:
-    """Represents a logic signal value."""
+    """Represents a logic signal value (immutable, so 1-bit values are shared)."""
     state: SignalState = SignalState.UNKNOWN
     bit_width: int = 1
     value: int = 0  # For multi-bit signals
@@ -37,17 +37,32 @@ class Signal:
     @staticmethod
     def from_bool(value: bool) -> 'Signal':
         """Create signal from boolean value."""
-        return Signal(SignalState.HIGH if value else SignalState.LOW, 1, 1 if value else 0)
+        return _SIGNAL_HIGH if value else _SIGNAL_LOW
     
     @staticmethod
     def from_int(value: int, bit_width: int = 1) -> 'Signal':
         """Create signal from integer value."""
+        if bit_width == 1 and value in (0, 1):
+            return _SIGNAL_HIGH if value else _SIGNAL_LOW
         if value == 0:
             return Signal(SignalState.LOW, bit_width, 0)
         else:
             return Signal(SignalState.HIGH, bit_width, value)
 
 
+# Shared instances for the four 1-bit states
+_SIGNAL_LOW = Signal(SignalState.LOW, 1, 0)
+_SIGNAL_HIGH = Signal(SignalState.HIGH, 1, 1)
+_SIGNAL_UNKNOWN = Signal(SignalState.UNKNOWN, 1, 0)
+_SIGNAL_HIGHZ = Signal(SignalState.HIGHZ, 1, 0)
+
+# Public aliases for the shared instances
+Signal.TRUE = _SIGNAL_HIGH
+Signal.FALSE = _SIGNAL_LOW
+Signal.UNKNOWN = _SIGNAL_UNKNOWN
+Signal.HIGHZ = _SIGNAL_HIGHZ
+
+
 class PinType(Enum):
     """Pin type enumeration."""
     INPUT = "input"
@@ -55,19 +70,34 @@ class PinType(Enum):
     INOUT = "inout"
 
 
-@dataclass
+@dataclass(slots=True)
 class Pin:
     """Represents a component pin (connection point)."""
     name: str
     pin_type: PinType
     position: Point  # Relative to component
-    signal: Signal = field(default_factory=lambda: Signal())
+    signal: Signal = _SIGNAL_UNKNOWN
     bit_width: int = 1
     connected_wires: List['Wire'] = field(default_factory=list)
+    idx: int = -1  # Position in the owning component's pin list (set by add_pin)
+    _hi: int = field(default=0, init=False, repr=False, compare=False)  # 1 while signal is HIGH
+    
+    def __post_init__(self):
+        self._hi = 1 if self.signal.state is SignalState.HIGH else 0
     
     def set_signal(self, signal: Signal):
         """Set the signal value on this pin."""
         self.signal = signal
+        self._hi = 1 if signal.state is SignalState.HIGH else 0
+    
+    def set_bit(self, bit):
+        """Drive the pin LOW or HIGH from a bit (or bool) without going through Signal."""
+        if bit:
+            self.signal = _SIGNAL_HIGH
+            self._hi = 1
+        else:
+            self.signal = _SIGNAL_LOW
+            self._hi = 0
     
     def get_signal(self) -> Signal:
         """Get the current signal value."""
@@ -77,17 +107,32 @@ class Pin:
 class Component:
     """Base class for all circuit components."""
     
+    __slots__ = ('id', 'label', '_position', '_bounds', 'pins', 'properties', 'selected', '_pin_list')
+    _SIZE = (60, 40)  # Default (width, height)
+    
     def __init__(self, component_id: str, label: str, position: Point):
         self.id = component_id
         self.label = label
         self.position = position
         self.pins: Dict[str, Pin] = {}
+        self._pin_list: List[Pin] = []  # Pins in creation order, indexed by _PIN_* constants
         self.properties: Dict[str, Any] = {}
         self.selected = False
     
+    @property
+    def position(self) -> Point:
+        return self._position
+    
+    @position.setter
+    def position(self, position: Point):
+        self._position = position
+        self._bounds = None  # Recomputed by the next get_bounds()
+    
     def add_pin(self, pin: Pin):
         """Add a pin to this component."""
+        pin.idx = len(self._pin_list)
         self.pins[pin.name] = pin
+        self._pin_list.append(pin)
     
     def get_pin(self, name: str) -> Optional[Pin]:
         """Get a pin by name."""
@@ -108,10 +153,17 @@ class Component:
         """
         raise NotImplementedError("Subclasses must implement evaluate()")
     
+    def get_size(self) -> tuple:
+        """Get (width, height); fixed-size components only set _SIZE."""
+        return self._SIZE
+    
     def get_bounds(self) -> tuple:
-        """Get bounding box (x, y, width, height)."""
-        # Default implementation, can be overridden
-        return (self.position.x, self.position.y, 60, 40)
+        """Get bounding box (x, y, width, height), cached until the component moves."""
+        bounds = self._bounds
+        if bounds is None:
+            width, height = self.get_size()
+            bounds = self._bounds = (self._position.x, self._position.y, width, height)
+        return bounds
     
     def to_dict(self) -> dict:
         """Serialize component to dictionary."""
@@ -130,24 +182,29 @@ class Component:
         raise NotImplementedError()
 
 
-@dataclass
+@dataclass(slots=True)
 class Wire:
     """Represents a wire connection between pins."""
     wire_id: str
     start_pin: Pin
     end_pin: Pin
     points: List[Point] = field(default_factory=list)
-    signal: Signal = field(default_factory=lambda: Signal())
+    signal: Signal = _SIGNAL_UNKNOWN
+    # Driving and driven pin, fixed when the wire is created (None if no output pin)
+    _src: Optional[Pin] = field(default=None, init=False, repr=False, compare=False)
+    _dst: Optional[Pin] = field(default=None, init=False, repr=False, compare=False)
     
-    def propagate(self):
-        """Propagate signal from source to destination."""
-        # Get signal from output pin
+    def __post_init__(self):
         if self.start_pin.pin_type == PinType.OUTPUT:
-            self.signal = self.start_pin.signal
-            self.end_pin.signal = self.signal
+            self._src, self._dst = self.start_pin, self.end_pin
         elif self.end_pin.pin_type == PinType.OUTPUT:
-            self.signal = self.end_pin.signal
-            self.start_pin.signal = self.signal
+            self._src, self._dst = self.end_pin, self.start_pin
+    
+    def propagate(self):
+        """Propagate signal from source to destination."""
+        if self._src is not None:
+            self.signal = self._src.signal
+            self._dst.set_signal(self.signal)
     
     def to_dict(self) -> dict:
         """Serialize wire to dictionary."""
@@ -168,6 +225,8 @@ class Circuit:
         self.wires: Dict[str, Wire] = {}
         self._next_component_id = 0
         self._next_wire_id = 0
+        self.revision = 0  # Bumped on every structural change
+        self._compiled = None
     
     def add_component(self, component: Component) -> str:
         """Add a component to the circuit."""
@@ -175,22 +234,20 @@ class Circuit:
             component.id = f"comp_{self._next_component_id}"
             self._next_component_id += 1
         self.components[component.id] = component
+        self.revision += 1
         return component.id
     
     def remove_component(self, component_id: str):
         """Remove a component from the circuit."""
         if component_id in self.components:
-            # Remove all connected wires
+            # Remove all connected wires (found through each pin's adjacency list)
             component = self.components[component_id]
-            wires_to_remove = []
-            for wire_id, wire in self.wires.items():
-                if wire.start_pin in component.pins.values() or wire.end_pin in component.pins.values():
-                    wires_to_remove.append(wire_id)
-            
-            for wire_id in wires_to_remove:
-                self.remove_wire(wire_id)
+            for pin in component.pins.values():
+                for wire in list(pin.connected_wires):
+                    self.remove_wire(wire.wire_id)
             
             del self.components[component_id]
+            self.revision += 1
     
     def add_wire(self, wire: Wire) -> str:
         """Add a wire to the circuit."""
@@ -201,6 +258,7 @@ class Circuit:
         self.wires[wire.wire_id] = wire
         wire.start_pin.connected_wires.append(wire)
         wire.end_pin.connected_wires.append(wire)
+        self.revision += 1
         return wire.wire_id
     
     def remove_wire(self, wire_id: str):
@@ -212,6 +270,7 @@ class Circuit:
             if wire in wire.end_pin.connected_wires:
                 wire.end_pin.connected_wires.remove(wire)
             del self.wires[wire_id]
+            self.revision += 1
     
     def get_component(self, component_id: str) -> Optional[Component]:
         """Get a component by ID."""
@@ -223,6 +282,22 @@ class Circuit:
         self.wires.clear()
         self._next_component_id = 0
         self._next_wire_id = 0
+        self.revision += 1
+    
+    def compile(self):
+        """
+        Compile the circuit into a flat array representation for simulation.
+        The result is cached until the circuit structure changes.
+        """
+        from simulation_kernel import CompiledCircuit
+        
+        if self._compiled is None or self._compiled.revision != self.revision:
+            self._compiled = CompiledCircuit(self)
+        return self._compiled
+    
+    def run(self, n_steps: int):
+        """Simulate several steps on the compiled circuit."""
+        self.compile().run(n_steps)
     
     def to_dict(self) -> dict:
         """Serialize circuit to dictionary."""
@@ -1,7 +1,7 @@
 """
 Base component classes and utilities.
 """
-from circuit_model import Component, Pin, PinType, Signal, SignalState
+from circuit_model import Component, Pin, PinType
 from utils.geometry import Point
 from typing import Dict, Any
 
@@ -9,6 +9,8 @@ from typing import Dict, Any
 class BaseGate(Component):
     """Base class for logic gates."""
     
+    __slots__ = ('num_inputs', '_in_pins', '_out_pin')
+    
     def __init__(self, component_id: str, label: str, position: Point, num_inputs: int = 2):
         super().__init__(component_id, label, position)
         self.num_inputs = num_inputs
@@ -17,6 +19,7 @@ class BaseGate(Component):
     def _setup_pins(self):
         """Setup input and output pins."""
         # Create input pins on the left
+        in_pins = []
         for i in range(self.num_inputs):
             y_offset = 10 + (i * 20) if self.num_inputs > 1 else 20
             pin = Pin(
@@ -25,6 +28,8 @@ class BaseGate(Component):
                 position=Point(0, y_offset)
             )
             self.add_pin(pin)
+            in_pins.append(pin)
+        self._in_pins = tuple(in_pins)
         
         # Create output pin on the right
         output_pin = Pin(
@@ -33,35 +38,42 @@ class BaseGate(Component):
             position=Point(60, 20)
         )
         self.add_pin(output_pin)
+        self._out_pin = output_pin
     
-    def get_input_values(self) -> list:
-        """Get boolean values of all inputs."""
-        values = []
-        for i in range(self.num_inputs):
-            pin = self.get_pin(f"in{i}")
-            if pin:
-                values.append(pin.signal.state == SignalState.HIGH)
-            else:
-                values.append(False)
-        return values
+    def input_pin(self, index: int) -> Pin:
+        """Get input pin `index` without a name lookup."""
+        return self._in_pins[index]
+    
+    def get_input_bits(self) -> int:
+        """Get inputs packed into an int, bit i set when input i is HIGH."""
+        bits = 0
+        for i, pin in enumerate(self._in_pins):
+            bits |= pin._hi << i
+        return bits
+    
+    def all_inputs_high(self, bits: int) -> bool:
+        """Check whether packed input bits have every input HIGH."""
+        return self.num_inputs > 0 and bits == (1 << self.num_inputs) - 1
 
 
 class BaseFlipFlop(Component):
     """Base class for flip-flops."""
     
+    __slots__ = ('state', 'last_clock')
+    
     def __init__(self, component_id: str, label: str, position: Point):
         super().__init__(component_id, label, position)
         self.state = False
-        self.last_clock = False
+        self.last_clock = 0  # Clock level seen last, as a 0/1 bit
     
-    def detect_rising_edge(self, clock_signal: bool) -> bool:
-        """Detect rising edge of clock signal."""
-        rising = not self.last_clock and clock_signal
-        self.last_clock = clock_signal
+    def detect_rising_edge(self, clock_signal: int) -> int:
+        """Detect rising edge of clock signal (0/1); returns 1 on an edge."""
+        rising = ~self.last_clock & clock_signal & 1
+        self.last_clock = clock_signal & 1
         return rising
     
-    def detect_falling_edge(self, clock_signal: bool) -> bool:
-        """Detect falling edge of clock signal."""
-        falling = self.last_clock and not clock_signal
-        self.last_clock = clock_signal
+    def detect_falling_edge(self, clock_signal: int) -> int:
+        """Detect falling edge of clock signal (0/1); returns 1 on an edge."""
+        falling = self.last_clock & ~clock_signal & 1
+        self.last_clock = clock_signal & 1
         return falling
@@ -1,103 +1,144 @@
 """
 Complex components: Multiplexer, Decoder, Adder, etc.
 """
-from circuit_model import Component, Pin, PinType, Signal, SignalState
-from utils.geometry import Point
+from circuit_model import Component, Pin, PinType
+from utils.geometry import ORIGIN, Point
+from typing import Callable, Dict, Tuple
+
+
+# Straight-line evaluate functions, generated once per (kind, size)
+_specialized: Dict[Tuple[str, int], Callable] = {}
+
+
+def _pack_expression(pins: str, count: int) -> str:
+    """Source for an int packing `count` pin flags, e.g. 'p[0]._hi | (p[1]._hi << 1)'."""
+    if count == 0:
+        return "0"
+    return " | ".join(f"({pins}[{i}]._hi << {i})" if i else f"{pins}[0]._hi" for i in range(count))
+
+
+def _specialize(kind: str, size: int, body: str) -> Callable:
+    """Compile a generated evaluate function for a fixed pin count, caching it."""
+    key = (kind, size)
+    function = _specialized.get(key)
+    if function is None:
+        namespace = {}
+        exec(f"def _evaluate(self):\n{body}", namespace)
+        function = _specialized[key] = namespace['_evaluate']
+    return function
 
 
 class Multiplexer(Component):
     """Multiplexer component."""
     
+    __slots__ = ('num_inputs', 'num_select', '_d_pins', '_s_pins', '_out_pin', '_evaluate')
+    
     def __init__(self, component_id: str = "", label: str = "MUX", position: Point = None, num_inputs: int = 4):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.num_inputs = num_inputs
         self.num_select = (num_inputs - 1).bit_length()  # log2(num_inputs)
         self._setup_pins()
+        self._evaluate = _specialize("mux", num_inputs, (
+            f"    select_value = {_pack_expression('self._s_pins', self.num_select)}\n"
+            f"    if select_value < {num_inputs}:\n"
+            f"        self._out_pin.set_signal(self._d_pins[select_value].signal)\n"
+            f"    else:\n"
+            f"        self._out_pin.set_bit(0)\n"
+        ))
     
     def _setup_pins(self):
         """Setup pins."""
         # Data inputs
-        for i in range(self.num_inputs):
-            self.add_pin(Pin(f"D{i}", PinType.INPUT, Point(0, 10 + i * 15)))
+        self._d_pins = tuple(Pin(f"D{i}", PinType.INPUT, Point(0, 10 + i * 15))
+                             for i in range(self.num_inputs))
         
         # Select inputs
-        for i in range(self.num_select):
-            self.add_pin(Pin(f"S{i}", PinType.INPUT, Point(20, 10 + self.num_inputs * 15 + i * 15)))
+        self._s_pins = tuple(Pin(f"S{i}", PinType.INPUT, Point(20, 10 + self.num_inputs * 15 + i * 15))
+                             for i in range(self.num_select))
         
         # Output
-        self.add_pin(Pin("OUT", PinType.OUTPUT, Point(80, 10 + (self.num_inputs * 15) // 2)))
+        self._out_pin = Pin("OUT", PinType.OUTPUT, Point(80, 10 + (self.num_inputs * 15) // 2))
+        
+        for pin in self._d_pins + self._s_pins + (self._out_pin,):
+            self.add_pin(pin)
     
     def evaluate(self):
-        """Evaluate multiplexer logic."""
-        # Read select inputs
-        select_value = 0
-        for i in range(self.num_select):
-            s_pin = self.get_pin(f"S{i}")
-            if s_pin.signal.state == SignalState.HIGH:
-                select_value |= (1 << i)
-        
-        # Output selected input
-        if select_value < self.num_inputs:
-            d_pin = self.get_pin(f"D{select_value}")
-            self.get_pin("OUT").set_signal(d_pin.signal)
-        else:
-            self.get_pin("OUT").set_signal(Signal.from_bool(False))
+        """Evaluate multiplexer logic (select decode unrolled for this size)."""
+        self._evaluate(self)
     
-    def get_bounds(self):
-        """Get bounding box."""
+    def get_size(self):
+        """Get (width, height)."""
         height = max(60, 20 + (self.num_inputs + self.num_select) * 15)
-        return (self.position.x, self.position.y, 80, height)
+        return (80, height)
 
 
 class Decoder(Component):
     """Decoder component."""
     
+    __slots__ = ('num_inputs', 'num_outputs', '_i_pins', '_o_pins', '_evaluate', '_prev')
+    
     def __init__(self, component_id: str = "", label: str = "Decoder", position: Point = None, num_inputs: int = 2):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.num_inputs = num_inputs
         self.num_outputs = 2 ** num_inputs
         self._setup_pins()
+        self._prev = -1  # Index of the HIGH output, -1 before the first evaluate
+        self._evaluate = _specialize("decoder", num_inputs, (
+            f"    self._select_output({_pack_expression('self._i_pins', num_inputs)})\n"
+        ))
     
     def _setup_pins(self):
         """Setup pins."""
         # Inputs
-        for i in range(self.num_inputs):
-            self.add_pin(Pin(f"I{i}", PinType.INPUT, Point(0, 10 + i * 15)))
+        self._i_pins = tuple(Pin(f"I{i}", PinType.INPUT, Point(0, 10 + i * 15))
+                             for i in range(self.num_inputs))
         
         # Outputs
-        for i in range(self.num_outputs):
-            self.add_pin(Pin(f"O{i}", PinType.OUTPUT, Point(80, 10 + i * 15)))
+        self._o_pins = tuple(Pin(f"O{i}", PinType.OUTPUT, Point(80, 10 + i * 15))
+                             for i in range(self.num_outputs))
+        
+        for pin in self._i_pins + self._o_pins:
+            self.add_pin(pin)
     
     def evaluate(self):
-        """Evaluate decoder logic."""
-        # Read input value
-        input_value = 0
-        for i in range(self.num_inputs):
-            i_pin = self.get_pin(f"I{i}")
-            if i_pin.signal.state == SignalState.HIGH:
-                input_value |= (1 << i)
-        
-        # Set outputs
-        for i in range(self.num_outputs):
-            o_pin = self.get_pin(f"O{i}")
-            o_pin.set_signal(Signal.from_bool(i == input_value))
+        """Evaluate decoder logic (input packing unrolled for this size)."""
+        self._evaluate(self)
+    
+    def _select_output(self, value: int):
+        """Make output `value` the single HIGH output, touching at most two pins."""
+        pins = self._o_pins
+        prev = self._prev
+        if prev < 0 or not pins[prev]._hi:
+            # First evaluation, or the outputs were reset from outside
+            for pin in pins:
+                pin.set_bit(0)
+        elif prev == value:
+            return
+        else:
+            pins[prev].set_bit(0)
+        pins[value].set_bit(1)
+        self._prev = value
     
-    def get_bounds(self):
-        """Get bounding box."""
+    def get_size(self):
+        """Get (width, height)."""
         height = max(60, 20 + self.num_outputs * 15)
-        return (self.position.x, self.position.y, 80, height)
+        return (80, height)
 
 
 class HalfAdder(Component):
     """Half adder component."""
     
+    __slots__ = ()
+    _PIN_A, _PIN_B, _PIN_SUM, _PIN_CARRY = range(4)
+    _SIZE = (80, 50)
+    
     def __init__(self, component_id: str = "", label: str = "Half Adder", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self._setup_pins()
     
@@ -110,26 +151,27 @@ class HalfAdder(Component):
     
     def evaluate(self):
         """Evaluate half adder logic."""
-        a = self.get_pin("A").signal.state == SignalState.HIGH
-        b = self.get_pin("B").signal.state == SignalState.HIGH
+        pins = self._pin_list
+        a = pins[self._PIN_A]._hi == 1
+        b = pins[self._PIN_B]._hi == 1
         
         sum_out = a ^ b  # XOR
         carry_out = a and b  # AND
         
-        self.get_pin("SUM").set_signal(Signal.from_bool(sum_out))
-        self.get_pin("CARRY").set_signal(Signal.from_bool(carry_out))
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 80, 50)
+        pins[self._PIN_SUM].set_bit(sum_out)
+        pins[self._PIN_CARRY].set_bit(carry_out)
 
 
 class FullAdder(Component):
     """Full adder component."""
     
+    __slots__ = ()
+    _PIN_A, _PIN_B, _PIN_CIN, _PIN_SUM, _PIN_COUT = range(5)
+    _SIZE = (80, 60)
+    
     def __init__(self, component_id: str = "", label: str = "Full Adder", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self._setup_pins()
     
@@ -143,68 +185,60 @@ class FullAdder(Component):
     
     def evaluate(self):
         """Evaluate full adder logic."""
-        a = self.get_pin("A").signal.state == SignalState.HIGH
-        b = self.get_pin("B").signal.state == SignalState.HIGH
-        cin = self.get_pin("CIN").signal.state == SignalState.HIGH
+        pins = self._pin_list
+        a = pins[self._PIN_A]._hi == 1
+        b = pins[self._PIN_B]._hi == 1
+        cin = pins[self._PIN_CIN]._hi == 1
         
         sum_out = a ^ b ^ cin
         carry_out = (a and b) or (cin and (a ^ b))
         
-        self.get_pin("SUM").set_signal(Signal.from_bool(sum_out))
-        self.get_pin("COUT").set_signal(Signal.from_bool(carry_out))
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 80, 60)
+        pins[self._PIN_SUM].set_bit(sum_out)
+        pins[self._PIN_COUT].set_bit(carry_out)
 
 
 class Comparator(Component):
     """Comparator component."""
     
+    __slots__ = ('bit_width', '_a_pins', '_b_pins', '_eq_pin', '_gt_pin', '_lt_pin', '_evaluate')
+    
     def __init__(self, component_id: str = "", label: str = "Comparator", position: Point = None, bit_width: int = 4):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.bit_width = bit_width
         self._setup_pins()
+        self._evaluate = _specialize("comparator", bit_width, (
+            f"    a_value = {_pack_expression('self._a_pins', bit_width)}\n"
+            f"    b_value = {_pack_expression('self._b_pins', bit_width)}\n"
+            f"    self._eq_pin.set_bit(a_value == b_value)\n"
+            f"    self._gt_pin.set_bit(a_value > b_value)\n"
+            f"    self._lt_pin.set_bit(a_value < b_value)\n"
+        ))
     
     def _setup_pins(self):
         """Setup pins."""
         # A inputs
-        for i in range(self.bit_width):
-            self.add_pin(Pin(f"A{i}", PinType.INPUT, Point(0, 10 + i * 10)))
+        self._a_pins = tuple(Pin(f"A{i}", PinType.INPUT, Point(0, 10 + i * 10))
+                             for i in range(self.bit_width))
         
         # B inputs
-        for i in range(self.bit_width):
-            self.add_pin(Pin(f"B{i}", PinType.INPUT, Point(0, 20 + self.bit_width * 10 + i * 10)))
+        self._b_pins = tuple(Pin(f"B{i}", PinType.INPUT, Point(0, 20 + self.bit_width * 10 + i * 10))
+                             for i in range(self.bit_width))
         
         # Outputs
-        self.add_pin(Pin("EQ", PinType.OUTPUT, Point(80, 10)))  # A == B
-        self.add_pin(Pin("GT", PinType.OUTPUT, Point(80, 30)))  # A > B
-        self.add_pin(Pin("LT", PinType.OUTPUT, Point(80, 50)))  # A < B
+        self._eq_pin = Pin("EQ", PinType.OUTPUT, Point(80, 10))  # A == B
+        self._gt_pin = Pin("GT", PinType.OUTPUT, Point(80, 30))  # A > B
+        self._lt_pin = Pin("LT", PinType.OUTPUT, Point(80, 50))  # A < B
+        
+        for pin in self._a_pins + self._b_pins + (self._eq_pin, self._gt_pin, self._lt_pin):
+            self.add_pin(pin)
     
     def evaluate(self):
-        """Evaluate comparator logic."""
-        # Read A value
-        a_value = 0
-        for i in range(self.bit_width):
-            a_pin = self.get_pin(f"A{i}")
-            if a_pin.signal.state == SignalState.HIGH:
-                a_value |= (1 << i)
-        
-        # Read B value
-        b_value = 0
-        for i in range(self.bit_width):
-            b_pin = self.get_pin(f"B{i}")
-            if b_pin.signal.state == SignalState.HIGH:
-                b_value |= (1 << i)
-        
-        # Set outputs
-        self.get_pin("EQ").set_signal(Signal.from_bool(a_value == b_value))
-        self.get_pin("GT").set_signal(Signal.from_bool(a_value > b_value))
-        self.get_pin("LT").set_signal(Signal.from_bool(a_value < b_value))
+        """Evaluate comparator logic (bit packing inlined for this width)."""
+        self._evaluate(self)
     
-    def get_bounds(self):
-        """Get bounding box."""
+    def get_size(self):
+        """Get (width, height)."""
         height = max(80, 30 + self.bit_width * 20)
-        return (self.position.x, self.position.y, 80, height)
+        return (80, height)
@@ -1,16 +1,21 @@
 """
 Input/Output components: Switch, Button, LED, Input Pin, Output Pin.
 """
-from circuit_model import Component, Pin, PinType, Signal, SignalState
-from utils.geometry import Point
+import numpy as np
+from circuit_model import Component, Pin, PinType
+from utils.geometry import ORIGIN, Point
 
 
 class Switch(Component):
     """Toggle switch component."""
     
+    __slots__ = ('state',)
+    _PIN_OUT = 0
+    _SIZE = (30, 30)
+    
     def __init__(self, component_id: str = "", label: str = "Switch", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.state = False
         self._setup_pins()
@@ -26,7 +31,7 @@ class Switch(Component):
     
     def evaluate(self):
         """Output current switch state."""
-        self.get_pin("out").set_signal(Signal.from_bool(self.state))
+        self._pin_list[self._PIN_OUT].set_bit(self.state)
     
     def toggle(self):
         """Toggle switch state."""
@@ -37,18 +42,18 @@ class Switch(Component):
         """Set switch state."""
         self.state = state
         self.evaluate()
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 30, 30)
 
 
 class Button(Component):
     """Push button component."""
     
+    __slots__ = ('pressed',)
+    _PIN_OUT = 0
+    _SIZE = (30, 30)
+    
     def __init__(self, component_id: str = "", label: str = "Button", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.pressed = False
         self._setup_pins()
@@ -64,7 +69,7 @@ class Button(Component):
     
     def evaluate(self):
         """Output current button state."""
-        self.get_pin("out").set_signal(Signal.from_bool(self.pressed))
+        self._pin_list[self._PIN_OUT].set_bit(self.pressed)
     
     def press(self):
         """Press button."""
@@ -75,18 +80,18 @@ class Button(Component):
         """Release button."""
         self.pressed = False
         self.evaluate()
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 30, 30)
 
 
 class LED(Component):
     """LED indicator component."""
     
+    __slots__ = ('lit',)
+    _PIN_IN = 0
+    _SIZE = (30, 30)
+    
     def __init__(self, component_id: str = "", label: str = "LED", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.lit = False
         self._setup_pins()
@@ -102,21 +107,19 @@ class LED(Component):
     
     def evaluate(self):
         """Update LED state based on input."""
-        input_pin = self.get_pin("in")
-        self.lit = input_pin.signal.state == SignalState.HIGH
-
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 30, 30)
+        self.lit = self._pin_list[self._PIN_IN]._hi == 1
 
 
 class InputPin(Component):
     """Input pin component for circuit inputs."""
     
+    __slots__ = ('value',)
+    _PIN_OUT = 0
+    _SIZE = (20, 20)
+    
     def __init__(self, component_id: str = "", label: str = "In", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.value = False
         self._setup_pins()
@@ -132,24 +135,24 @@ class InputPin(Component):
     
     def evaluate(self):
         """Output current value."""
-        self.get_pin("out").set_signal(Signal.from_bool(self.value))
+        self._pin_list[self._PIN_OUT].set_bit(self.value)
     
     def set_value(self, value: bool):
         """Set input value."""
         self.value = value
         self.evaluate()
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 20, 20)
 
 
 class OutputPin(Component):
     """Output pin component for circuit outputs."""
     
+    __slots__ = ('value',)
+    _PIN_IN = 0
+    _SIZE = (20, 20)
+    
     def __init__(self, component_id: str = "", label: str = "Out", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.value = False
         self._setup_pins()
@@ -165,20 +168,19 @@ class OutputPin(Component):
     
     def evaluate(self):
         """Read input value."""
-        input_pin = self.get_pin("in")
-        self.value = input_pin.signal.state == SignalState.HIGH
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 20, 20)
+        self.value = self._pin_list[self._PIN_IN]._hi == 1
 
 
 class Clock(Component):
     """Clock signal generator."""
     
+    __slots__ = ('state', 'tick_count', 'frequency')
+    _PIN_OUT = 0
+    _SIZE = (30, 30)
+    
     def __init__(self, component_id: str = "", label: str = "Clock", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.state = False
         self.tick_count = 0
@@ -200,8 +202,29 @@ class Clock(Component):
         if self.tick_count >= self.frequency:
             self.state = not self.state
             self.tick_count = 0
-        self.get_pin("out").set_signal(Signal.from_bool(self.state))
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 30, 30)
+        self._pin_list[self._PIN_OUT].set_bit(self.state)
+    
+    def _tick_span(self):
+        """Period and starting tick count for the next evaluate() calls."""
+        frequency = max(self.frequency, 1)
+        # A count at or past the period toggles on the next tick, like period - 1
+        return frequency, min(self.tick_count, frequency - 1)
+    
+    def waveform(self, n_steps: int) -> np.ndarray:
+        """
+        Clock values for the next n_steps evaluate() calls, computed in one go.
+        The clock itself is not advanced (see advance()).
+        """
+        frequency, count = self._tick_span()
+        ticks = np.arange(count + 1, count + n_steps + 1)
+        return ((ticks // frequency) & 1).astype(bool) ^ self.state
+    
+    def advance(self, n_steps: int):
+        """Advance the clock as if evaluate() had been called n_steps times."""
+        if n_steps <= 0:
+            return
+        frequency, count = self._tick_span()
+        count += n_steps
+        self.state = self.state ^ bool((count // frequency) & 1)
+        self.tick_count = count % frequency
+        self._pin_list[self._PIN_OUT].set_bit(self.state)
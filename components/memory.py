@@ -2,16 +2,20 @@
 Memory components: D Flip-Flop, JK Flip-Flop, SR Latch, Register.
 """
 from components.base import BaseFlipFlop
-from circuit_model import Component, Pin, PinType, Signal, SignalState
-from utils.geometry import Point
+from circuit_model import Component, Pin, PinType
+from utils.geometry import ORIGIN, Point
 
 
 class DFlipFlop(BaseFlipFlop):
     """D Flip-Flop component."""
     
+    __slots__ = ('_d', '_clk', '_q', '_qn')
+    _PIN_D, _PIN_CLK, _PIN_Q, _PIN_QN = range(4)
+    _SIZE = (60, 50)
+    
     def __init__(self, component_id: str = "", label: str = "D-FF", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self._setup_pins()
     
@@ -25,35 +29,32 @@ class DFlipFlop(BaseFlipFlop):
         self.add_pin(Pin("Q", PinType.OUTPUT, Point(60, 10)))
         # Q' output
         self.add_pin(Pin("Q'", PinType.OUTPUT, Point(60, 30)))
+        
+        pins = self._pin_list
+        self._d, self._clk = pins[self._PIN_D], pins[self._PIN_CLK]
+        self._q, self._qn = pins[self._PIN_Q], pins[self._PIN_QN]
     
     def evaluate(self):
         """Evaluate D flip-flop logic."""
-        d_pin = self.get_pin("D")
-        clk_pin = self.get_pin("CLK")
-        q_pin = self.get_pin("Q")
-        qn_pin = self.get_pin("Q'")
-        
-        clock = clk_pin.signal.state == SignalState.HIGH
-        
         # On rising edge, capture D input
-        if self.detect_rising_edge(clock):
-            self.state = d_pin.signal.state == SignalState.HIGH
+        if self.detect_rising_edge(self._clk._hi):
+            self.state = self._d._hi == 1
         
         # Output current state
-        q_pin.set_signal(Signal.from_bool(self.state))
-        qn_pin.set_signal(Signal.from_bool(not self.state))
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 60, 50)
+        self._q.set_bit(self.state)
+        self._qn.set_bit(not self.state)
 
 
 class JKFlipFlop(BaseFlipFlop):
     """JK Flip-Flop component."""
     
+    __slots__ = ('_j', '_k', '_clk', '_q', '_qn')
+    _PIN_J, _PIN_K, _PIN_CLK, _PIN_Q, _PIN_QN = range(5)
+    _SIZE = (60, 60)
+    
     def __init__(self, component_id: str = "", label: str = "JK-FF", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self._setup_pins()
     
@@ -64,43 +65,35 @@ class JKFlipFlop(BaseFlipFlop):
         self.add_pin(Pin("CLK", PinType.INPUT, Point(0, 40)))
         self.add_pin(Pin("Q", PinType.OUTPUT, Point(60, 10)))
         self.add_pin(Pin("Q'", PinType.OUTPUT, Point(60, 40)))
+        
+        pins = self._pin_list
+        self._j, self._k, self._clk = pins[self._PIN_J], pins[self._PIN_K], pins[self._PIN_CLK]
+        self._q, self._qn = pins[self._PIN_Q], pins[self._PIN_QN]
     
     def evaluate(self):
         """Evaluate JK flip-flop logic."""
-        j_pin = self.get_pin("J")
-        k_pin = self.get_pin("K")
-        clk_pin = self.get_pin("CLK")
-        q_pin = self.get_pin("Q")
-        qn_pin = self.get_pin("Q'")
-        
-        j = j_pin.signal.state == SignalState.HIGH
-        k = k_pin.signal.state == SignalState.HIGH
-        clock = clk_pin.signal.state == SignalState.HIGH
+        j = self._j._hi == 1
+        k = self._k._hi == 1
         
-        # On rising edge
-        if self.detect_rising_edge(clock):
-            if j and k:
-                self.state = not self.state  # Toggle
-            elif j:
-                self.state = True  # Set
-            elif k:
-                self.state = False  # Reset
-            # else: hold current state
+        # On rising edge: Q+ = J.Q' + K'.Q (hold, reset, set or toggle)
+        if self.detect_rising_edge(self._clk._hi):
+            q = self.state
+            self.state = (j and not q) or (not k and q)
         
-        q_pin.set_signal(Signal.from_bool(self.state))
-        qn_pin.set_signal(Signal.from_bool(not self.state))
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 60, 60)
+        self._q.set_bit(self.state)
+        self._qn.set_bit(not self.state)
 
 
 class SRLatch(Component):
     """SR Latch component."""
     
+    __slots__ = ('state', '_s', '_r', '_q', '_qn')
+    _PIN_S, _PIN_R, _PIN_Q, _PIN_QN = range(4)
+    _SIZE = (60, 50)
+    
     def __init__(self, component_id: str = "", label: str = "SR Latch", position: Point = None):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.state = False
         self._setup_pins()
@@ -111,16 +104,15 @@ class SRLatch(Component):
         self.add_pin(Pin("R", PinType.INPUT, Point(0, 30)))
         self.add_pin(Pin("Q", PinType.OUTPUT, Point(60, 10)))
         self.add_pin(Pin("Q'", PinType.OUTPUT, Point(60, 30)))
+        
+        pins = self._pin_list
+        self._s, self._r = pins[self._PIN_S], pins[self._PIN_R]
+        self._q, self._qn = pins[self._PIN_Q], pins[self._PIN_QN]
     
     def evaluate(self):
         """Evaluate SR latch logic."""
-        s_pin = self.get_pin("S")
-        r_pin = self.get_pin("R")
-        q_pin = self.get_pin("Q")
-        qn_pin = self.get_pin("Q'")
-        
-        s = s_pin.signal.state == SignalState.HIGH
-        r = r_pin.signal.state == SignalState.HIGH
+        s = self._s._hi == 1
+        r = self._r._hi == 1
         
         if s and not r:
             self.state = True  # Set
@@ -129,24 +121,22 @@ class SRLatch(Component):
         # If both S and R are high, state is undefined (we'll keep current state)
         # If both are low, hold current state
         
-        q_pin.set_signal(Signal.from_bool(self.state))
-        qn_pin.set_signal(Signal.from_bool(not self.state))
-    
-    def get_bounds(self):
-        """Get bounding box."""
-        return (self.position.x, self.position.y, 60, 50)
+        self._q.set_bit(self.state)
+        self._qn.set_bit(not self.state)
 
 
 class Register(Component):
     """Multi-bit register component."""
     
+    __slots__ = ('bit_width', 'value', 'last_clock', '_d_pins', '_clk_pin', '_q_pins', '_masks')
+    
     def __init__(self, component_id: str = "", label: str = "Register", position: Point = None, bit_width: int = 4):
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         super().__init__(component_id, label, position)
         self.bit_width = bit_width
         self.value = 0
-        self.last_clock = False
+        self.last_clock = 0
         self._setup_pins()
     
     def _setup_pins(self):
@@ -161,31 +151,36 @@ class Register(Component):
         # Data outputs
         for i in range(self.bit_width):
             self.add_pin(Pin(f"Q{i}", PinType.OUTPUT, Point(80, 10 + i * 10)))
+        
+        # Pin layout: D0..Dn-1, CLK, Q0..Qn-1
+        width = self.bit_width
+        self._d_pins = tuple(self._pin_list[:width])
+        self._clk_pin = self._pin_list[width]
+        self._q_pins = tuple(self._pin_list[width + 1:])
+        self._masks = tuple(1 << i for i in range(width))
     
     def evaluate(self):
         """Evaluate register logic."""
-        clk_pin = self.get_pin("CLK")
-        clock = clk_pin.signal.state == SignalState.HIGH
+        clock = self._clk_pin._hi
         
         # Detect rising edge
-        rising_edge = not self.last_clock and clock
+        rising_edge = ~self.last_clock & clock & 1
         self.last_clock = clock
         
         # On rising edge, capture inputs
         if rising_edge:
-            self.value = 0
-            for i in range(self.bit_width):
-                d_pin = self.get_pin(f"D{i}")
-                if d_pin.signal.state == SignalState.HIGH:
-                    self.value |= (1 << i)
+            value = 0
+            for mask, pin in zip(self._masks, self._d_pins):
+                if pin._hi:
+                    value |= mask
+            self.value = value
         
         # Output current value
-        for i in range(self.bit_width):
-            q_pin = self.get_pin(f"Q{i}")
-            bit_value = (self.value >> i) & 1
-            q_pin.set_signal(Signal.from_bool(bool(bit_value)))
+        value = self.value
+        for mask, pin in zip(self._masks, self._q_pins):
+            pin.set_bit(value & mask)
     
-    def get_bounds(self):
-        """Get bounding box."""
+    def get_size(self):
+        """Get (width, height)."""
         height = max(60, 20 + self.bit_width * 10)
-        return (self.position.x, self.position.y, 80, height)
+        return (80, height)
@@ -1,9 +1,9 @@
 """
 Component registry for creating components by name.
 """
-from typing import Type, Dict
+from typing import Type, Dict, List
 from circuit_model import Component
-from utils.geometry import Point
+from utils.geometry import ORIGIN, Point
 
 # Import all component types
 from components.gates import (
@@ -17,47 +17,61 @@ from components.complex import Multiplexer, Decoder, HalfAdder, FullAdder, Compa
 class ComponentRegistry:
     """Registry for all available component types."""
     
+    # Keyed by the registered name, its lowercase form and the class name
+    # (used in saved files), so most lookups need no case folding
     _registry: Dict[str, Type[Component]] = {}
+    _types: List[str] = []
+    
+    # Palette categories; fixed, so built once (callers must not modify it)
+    _categories: Dict[str, list] = {
+        "Gates": ["and", "or", "not", "xor", "nand", "nor", "xnor", "buffer"],
+        "Input/Output": ["switch", "button", "led", "inputpin", "outputpin", "clock"],
+        "Memory": ["dflipflop", "jkflipflop", "srlatch", "register"],
+        "Complex": ["multiplexer", "decoder", "halfadder", "fulladder", "comparator"]
+    }
     
     @classmethod
     def register(cls, name: str, component_class: Type[Component]):
-        """Register a component type."""
+        """Register a component type (also reachable by its class name)."""
+        cls._registry[name] = component_class
         cls._registry[name.lower()] = component_class
+        cls._registry.setdefault(component_class.__name__, component_class)
+        if name.lower() not in cls._types:
+            cls._types.append(name.lower())
+    
+    @classmethod
+    def get_class(cls, component_type: str) -> Type[Component]:
+        """Component class for a type name or class name."""
+        component_class = cls._registry.get(component_type)
+        if component_class is None:
+            component_class = cls._registry.get(component_type.lower())
+            if component_class is None:
+                raise ValueError(f"Unknown component type: {component_type}")
+        return component_class
     
     @classmethod
     def create(cls, component_type: str, component_id: str = "", label: str = "", 
                position: Point = None, **kwargs) -> Component:
-        """Create a component by type name."""
-        component_type_lower = component_type.lower()
-        
-        if component_type_lower not in cls._registry:
-            raise ValueError(f"Unknown component type: {component_type}")
-        
-        component_class = cls._registry[component_type_lower]
+        """Create a component by type name or class name."""
+        component_class = cls.get_class(component_type)
         
         if position is None:
-            position = Point(0, 0)
+            position = ORIGIN
         
         # Create component with appropriate parameters
-        if label == "":
-            label = component_type
+        label = label if label != "" else component_type
         
         return component_class(component_id=component_id, label=label, position=position, **kwargs)
     
     @classmethod
     def get_all_types(cls) -> list:
         """Get list of all registered component types."""
-        return sorted(cls._registry.keys())
+        return sorted(cls._types)
     
     @classmethod
     def get_categories(cls) -> Dict[str, list]:
         """Get components organized by category."""
-        return {
-            "Gates": ["and", "or", "not", "xor", "nand", "nor", "xnor", "buffer"],
-            "Input/Output": ["switch", "button", "led", "inputpin", "outputpin", "clock"],
-            "Memory": ["dflipflop", "jkflipflop", "srlatch", "register"],
-            "Complex": ["multiplexer", "decoder", "halfadder", "fulladder", "comparator"]
-        }
+        return cls._categories
 
 
 # Register all component types
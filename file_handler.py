@@ -3,6 +3,12 @@ File handler for saving and loading circuits.
 """
 import json
 from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; stdlib json is used instead
+    orjson = None
+
 from circuit_model import Circuit, Wire, Signal, SignalState, PinType
 from components.registry import ComponentRegistry
 from utils.geometry import Point
@@ -14,54 +20,20 @@ class FileHandler:
     
     @staticmethod
     def save_circuit(circuit: Circuit, filename: str) -> bool:
-        """Save circuit to JSON file."""
+        """Save circuit to JSON file, streaming one component or wire per line."""
         try:
-            data = {
-                'version': FILE_VERSION,
-                'name': circuit.name,
-                'components': [],
-                'wires': []
-            }
+            if orjson is not None:
+                encode = orjson.dumps
+            else:
+                encode = lambda obj: json.dumps(obj).encode()
             
-            # Serialize components
-            for comp_id, component in circuit.components.items():
-                comp_data = {
-                    'id': comp_id,
-                    'type': component.__class__.__name__,
-                    'label': component.label,
-                    'position': {
-                        'x': component.position.x,
-                        'y': component.position.y
-                    },
-                    'properties': component.properties
-                }
-                data['components'].append(comp_data)
-            
-            # Serialize wires
-            for wire_id, wire in circuit.wires.items():
-                # Find component IDs for pins
-                start_comp_id = None
-                end_comp_id = None
-                
-                for comp_id, comp in circuit.components.items():
-                    if wire.start_pin in comp.pins.values():
-                        start_comp_id = comp_id
-                    if wire.end_pin in comp.pins.values():
-                        end_comp_id = comp_id
-                
-                if start_comp_id and end_comp_id:
-                    wire_data = {
-                        'id': wire_id,
-                        'start_component': start_comp_id,
-                        'start_pin': wire.start_pin.name,
-                        'end_component': end_comp_id,
-                        'end_pin': wire.end_pin.name
-                    }
-                    data['wires'].append(wire_data)
-            
-            # Write to file
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            with open(filename, 'wb') as f:
+                f.write(b'{\n  "version": ' + encode(FILE_VERSION) +
+                        b',\n  "name": ' + encode(circuit.name) + b',\n')
+                FileHandler._write_array(f, 'components', FileHandler._component_records(circuit), encode)
+                f.write(b',\n')
+                FileHandler._write_array(f, 'wires', FileHandler._wire_records(circuit), encode)
+                f.write(b'\n}\n')
             
             return True
         
@@ -69,12 +41,63 @@ class FileHandler:
             print(f"Error saving circuit: {e}")
             return False
     
+    @staticmethod
+    def _write_array(f, key: str, records, encode):
+        """Write records as a JSON array member, one encoded record at a time."""
+        f.write(b'  "' + key.encode() + b'": [')
+        separator = b'\n    '
+        for record in records:
+            f.write(separator)
+            f.write(encode(record))
+            separator = b',\n    '
+        f.write(b'\n  ]')
+    
+    @staticmethod
+    def _component_records(circuit: Circuit):
+        """Yield the saved form of each component."""
+        for comp_id, component in circuit.components.items():
+            yield {
+                'id': comp_id,
+                'type': component.__class__.__name__,
+                'label': component.label,
+                'position': {
+                    'x': component.position.x,
+                    'y': component.position.y
+                },
+                'properties': component.properties
+            }
+    
+    @staticmethod
+    def _wire_records(circuit: Circuit):
+        """Yield the saved form of each wire whose endpoints belong to components."""
+        # Map each pin (by identity) to the ID of the component owning it;
+        # a pin shared by several components keeps its first owner
+        pin_owner = {}
+        for comp_id, comp in circuit.components.items():
+            for pin in comp.pins.values():
+                pin_owner.setdefault(id(pin), comp_id)
+        
+        for wire_id, wire in circuit.wires.items():
+            # Find component IDs for pins
+            start_comp_id = pin_owner.get(id(wire.start_pin))
+            end_comp_id = pin_owner.get(id(wire.end_pin))
+            
+            if start_comp_id and end_comp_id:
+                yield {
+                    'id': wire_id,
+                    'start_component': start_comp_id,
+                    'start_pin': wire.start_pin.name,
+                    'end_component': end_comp_id,
+                    'end_pin': wire.end_pin.name
+                }
+    
     @staticmethod
     def load_circuit(filename: str) -> Optional[Circuit]:
         """Load circuit from JSON file."""
         try:
-            with open(filename, 'r') as f:
-                data = json.load(f)
+            with open(filename, 'rb') as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             # Create circuit
             circuit = Circuit(data.get('name', 'Untitled'))
@@ -88,38 +111,10 @@ class FileHandler:
                 pos = comp_data['position']
                 position = Point(pos['x'], pos['y'])
                 
-                # Map class names to registry names
-                type_mapping = {
-                    'ANDGate': 'and',
-                    'ORGate': 'or',
-                    'NOTGate': 'not',
-                    'XORGate': 'xor',
-                    'NANDGate': 'nand',
-                    'NORGate': 'nor',
-                    'XNORGate': 'xnor',
-                    'BufferGate': 'buffer',
-                    'Switch': 'switch',
-                    'Button': 'button',
-                    'LED': 'led',
-                    'InputPin': 'inputpin',
-                    'OutputPin': 'outputpin',
-                    'Clock': 'clock',
-                    'DFlipFlop': 'dflipflop',
-                    'JKFlipFlop': 'jkflipflop',
-                    'SRLatch': 'srlatch',
-                    'Register': 'register',
-                    'Multiplexer': 'multiplexer',
-                    'Decoder': 'decoder',
-                    'HalfAdder': 'halfadder',
-                    'FullAdder': 'fulladder',
-                    'Comparator': 'comparator'
-                }
-                
-                registry_name = type_mapping.get(comp_type, comp_type.lower())
-                
                 try:
+                    # Saved types are class names, which the registry also accepts
                     component = ComponentRegistry.create(
-                        registry_name,
+                        comp_type,
                         component_id=comp_id,
                         label=label,
                         position=position
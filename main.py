@@ -94,10 +94,8 @@ class LogisimApp:
     
     def on_circuit_updated(self):
         """Handle circuit update from prompt."""
-        self.canvas.update_canvas()
-        # Auto-run simulation steps
-        self.simulation.step()
-        self.simulation.step()
+        # One step settles the new circuit (it is evaluated in topological
+        # order, loops are iterated to a fixed point), then redraw once
         self.simulation.step()
         self.canvas.update_canvas()
     
@@ -129,9 +127,8 @@ class LogisimApp:
                     circuit = FileHandler.load_circuit(file_path)
                     if circuit:
                         self.circuit = circuit
-                        self.simulation = SimulationEngine(self.circuit)
+                        self.simulation.replace_circuit(self.circuit)
                         self.canvas.circuit = self.circuit
-                        self.canvas.simulation = self.simulation
                         self.canvas.update_canvas()
                         self.show_status(f"Открыто: {file_path}")
                     else:
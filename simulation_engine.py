@@ -1,10 +1,7 @@
 """
 Simulation engine for circuit evaluation and signal propagation.
 """
-from typing import List, Set, Dict
-from collections import deque
-from circuit_model import Circuit, Component, Wire, Signal, SignalState, PinType
-from utils.constants import SIM_MAX_PROPAGATION_DEPTH
+from circuit_model import Circuit, Component, Wire, Signal, PinType
 
 
 class SimulationEngine:
@@ -14,22 +11,18 @@ class SimulationEngine:
         self.circuit = circuit
         self.running = False
         self.tick_count = 0
-        self.propagation_queue: deque = deque()
-        self.evaluated_components: Set[str] = set()
+    
+    def replace_circuit(self, circuit: Circuit):
+        """Simulate another circuit with this engine, e.g. after opening a file."""
+        self.circuit = circuit
+        self.tick_count = 0
     
     def reset(self):
         """Reset simulation state."""
         self.tick_count = 0
-        self.propagation_queue.clear()
-        self.evaluated_components.clear()
         
-        # Reset all signals to unknown
-        for component in self.circuit.components.values():
-            for pin in component.pins.values():
-                pin.signal = Signal(SignalState.UNKNOWN)
-        
-        for wire in self.circuit.wires.values():
-            wire.signal = Signal(SignalState.UNKNOWN)
+        # Nets are cleared in one fill; pins and wires are marked unknown
+        self.circuit.compile().reset()
     
     def start(self):
         """Start continuous simulation."""
@@ -40,62 +33,20 @@ class SimulationEngine:
         """Stop simulation."""
         self.running = False
     
-    def step(self):
-        """Execute one simulation step."""
-        self.tick_count += 1
-        self.evaluated_components.clear()
-        
-        # Propagate signals through wires FIRST
-        self._propagate_signals()
-        
-        # Then evaluate all components
-        self._evaluate_circuit()
-        
-        # Propagate again after evaluation
-        self._propagate_signals()
-    
-    def _evaluate_circuit(self):
-        """Evaluate all components in the circuit."""
-        # Build dependency graph and evaluate in topological order
-        # For simplicity, we'll use iterative evaluation with a fixed number of passes
+    def step(self, n_steps: int = 1) -> bool:
+        """
+        Execute one simulation step (or n_steps, publishing only the last).
         
-        max_iterations = SIM_MAX_PROPAGATION_DEPTH
-        iteration = 0
+        Returns True if any pin or wire signal changed, i.e. if a redraw is needed.
+        """
+        self.tick_count += n_steps
         
-        while iteration < max_iterations:
-            changed = False
-            
-            for component in self.circuit.components.values():
-                try:
-                    # Store old output values
-                    old_outputs = {}
-                    for pin in component.get_output_pins():
-                        old_outputs[pin.name] = pin.signal.state
-                    
-                    # Evaluate component
-                    component.evaluate()
-                    
-                    # Check if outputs changed
-                    for pin in component.get_output_pins():
-                        if old_outputs.get(pin.name) != pin.signal.state:
-                            changed = True
-                    
-                except Exception as e:
-                    print(f"Error evaluating component {component.id}: {e}")
-            
-            iteration += 1
-            
-            # If nothing changed, we've reached steady state
-            if not changed:
-                break
-        
-        if iteration >= max_iterations:
-            print(f"Warning: Simulation did not converge after {max_iterations} iterations")
-    
-    def _propagate_signals(self):
-        """Propagate signals through all wires."""
-        for wire in self.circuit.wires.values():
-            wire.propagate()
+        # Evaluate the compiled (vectorized) form of the circuit; it is
+        # rebuilt automatically whenever the circuit structure changes
+        compiled = self.circuit.compile()
+        if n_steps == 1:
+            return compiled.step()
+        return compiled.run(n_steps)
     
     def set_input(self, component_id: str, pin_name: str, value: bool):
         """Set an input value (for switches, buttons, etc.)."""
@@ -103,7 +54,8 @@ class SimulationEngine:
         if component:
             pin = component.get_pin(pin_name)
             if pin and pin.pin_type == PinType.INPUT:
-                pin.signal = Signal.from_bool(value)
+                pin.set_bit(value)
+                self.circuit.compile().set_pin(pin, value)
     
     def get_output(self, component_id: str, pin_name: str) -> Signal:
         """Get an output signal value."""
@@ -112,7 +64,7 @@ class SimulationEngine:
             pin = component.get_pin(pin_name)
             if pin:
                 return pin.signal
-        return Signal(SignalState.UNKNOWN)
+        return Signal.UNKNOWN
     
     def toggle_input(self, component_id: str, pin_name: str):
         """Toggle an input value."""
@@ -120,5 +72,6 @@ class SimulationEngine:
         if component:
             pin = component.get_pin(pin_name)
             if pin and pin.pin_type == PinType.INPUT:
-                current = pin.signal.state == SignalState.HIGH
-                pin.signal = Signal.from_bool(not current)
+                current = pin._hi == 1
+                pin.set_bit(not current)
+                self.circuit.compile().set_pin(pin, not current)
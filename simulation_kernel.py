@@ -0,0 +1,915 @@
+"""
+Compiled circuit representation for vectorized simulation.
+
+Circuit.compile() flattens the editable object graph (components, pins and
+wires) into NumPy arrays: every electrical net gets an integer index into a
+single ``signals`` buffer, and gates of the same kind are grouped into index
+tables (padded to a common fan-in with constant nets) so that each group is
+evaluated with one vectorized operation per simulation step. Multiplexers,
+decoders, comparators and adders are evaluated the same way, as blocks, and
+D/JK flip-flops and registers keep their state in lane words next to the nets.
+
+Components are scheduled once, at compile time, in topological order
+(Kahn's algorithm), so acyclic logic settles in a single pass; only circuits
+with feedback loops are iterated to a fixed point. Clocked components are
+two-phase: during a pass they sample pre-edge values, and their new states
+are committed after it, followed by another pass. Simulation is
+event-driven: a step does no work unless a source changed, and components
+evaluated in Python are skipped while their input nets are unchanged.
+
+Each net holds a 64-bit word: bit i is the net value in simulation lane i.
+Interactive simulation keeps all lanes equal (LOW = 0, HIGH = all ones), so
+gates reduce to plain bitwise &, |, ^ and ~ on whole words, and
+evaluate_lanes() can settle 64 independent input vectors in a single pass.
+
+When Numba is installed the gate pass runs as a single native function over
+a flat instruction stream (prebuilt by build_sim_kernel.py, or JIT-compiled
+on first use); otherwise each gate group is one NumPy call.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+from collections import deque
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+from circuit_model import Circuit, Component, Pin, PinType, Signal
+from components.base import BaseFlipFlop
+from components.gates import (
+    ANDGate, ORGate, NOTGate, XORGate, NANDGate, NORGate, XNORGate, BufferGate
+)
+from components.complex import Comparator, Decoder, FullAdder, HalfAdder, Multiplexer
+from components.io import Clock
+from components.memory import DFlipFlop, JKFlipFlop, Register, SRLatch
+from utils.constants import SIM_MAX_PROPAGATION_DEPTH
+
+log = logging.getLogger(__name__)
+
+
+# Gate classes evaluated by the vectorized kernel
+_GATE_KINDS = {
+    ANDGate: "and",
+    ORGate: "or",
+    NOTGate: "not",
+    XORGate: "xor",
+    NANDGate: "nand",
+    NORGate: "nor",
+    XNORGate: "xnor",
+    BufferGate: "buffer",
+}
+
+# Combinational components evaluated as vectorized blocks
+_BLOCK_KINDS = {
+    Multiplexer: "mux",
+    Decoder: "decoder",
+    Comparator: "comparator",
+    HalfAdder: "half_adder",
+    FullAdder: "full_adder",
+}
+
+# Edge-triggered components evaluated as vectorized blocks, with each
+# stored bit and each last clock level held in a lane word
+_FLIPFLOP_KINDS = {
+    DFlipFlop: "dff",
+    JKFlipFlop: "jkff",
+    Register: "register",
+}
+
+# Gate kinds whose padding input must be HIGH (the neutral element of AND)
+_PAD_HIGH = ("and", "nand")
+
+# Components holding state; feedback loops are preferably broken at these
+_STATEFUL = (BaseFlipFlop, SRLatch, Register)
+
+# Stateful components that only sample their data inputs on a clock edge
+_EDGE_TRIGGERED = (BaseFlipFlop, Register)
+
+# Plan stage tags
+_STAGE_GATES = "gates"
+_STAGE_BLOCKS = "blocks"
+_STAGE_FLIPFLOPS = "flipflops"
+_STAGE_COMPONENT = "component"
+
+# Net words for the two logic levels (all lanes equal)
+LOW = np.uint64(0)
+HIGH = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# Row-wise reductions over a (num_gates, fan_in) matrix of input words
+_GATE_OPS = {
+    "and": lambda values: np.bitwise_and.reduce(values, axis=1),
+    "or": lambda values: np.bitwise_or.reduce(values, axis=1),
+    "not": lambda values: ~values[:, 0],
+    "xor": lambda values: np.bitwise_xor.reduce(values, axis=1),
+    "nand": lambda values: ~np.bitwise_and.reduce(values, axis=1),
+    "nor": lambda values: ~np.bitwise_or.reduce(values, axis=1),
+    "xnor": lambda values: ~np.bitwise_xor.reduce(values, axis=1),
+    "buffer": lambda values: values[:, 0],
+}
+
+# Instruction encoding for the native kernel: base reduction plus an
+# inversion mask that is XOR-ed into the result (NAND = AND ^ ones, ...)
+_OP_AND, _OP_OR, _OP_XOR, _OP_BUFFER = 0, 1, 2, 3
+_GATE_INSTRUCTIONS = {
+    "and": (_OP_AND, LOW),
+    "or": (_OP_OR, LOW),
+    "xor": (_OP_XOR, LOW),
+    "buffer": (_OP_BUFFER, LOW),
+    "nand": (_OP_AND, HIGH),
+    "nor": (_OP_OR, HIGH),
+    "xnor": (_OP_XOR, HIGH),
+    "not": (_OP_BUFFER, HIGH),
+}
+
+
+def _select_patterns(num_select: int, count: int) -> np.ndarray:
+    """Boolean (count, num_select) matrix: row i holds the select bits of value i."""
+    return (np.arange(count)[:, None] >> np.arange(num_select)[None, :]) & 1 == 1
+
+
+def _match_rows(select: np.ndarray, patterns: np.ndarray) -> np.ndarray:
+    """
+    Words that are all ones in the lanes where the select bits equal each
+    pattern: (num_blocks, num_select) -> (num_blocks, len(patterns)).
+    """
+    bits = np.where(patterns[None, :, :], select[:, None, :], ~select[:, None, :])
+    return np.bitwise_and.reduce(bits, axis=2)
+
+
+def _mux_op(num_inputs: int, num_select: int):
+    """Block op for multiplexers; inputs are D0..Dn-1 then S0..Sk-1."""
+    patterns = _select_patterns(num_select, num_inputs)
+    
+    def op(values):
+        match = _match_rows(values[:, num_inputs:], patterns)
+        # Out-of-range selects match no row and give LOW
+        return np.bitwise_or.reduce(match & values[:, :num_inputs], axis=1)[:, None]
+    return op
+
+
+def _decoder_op(num_inputs: int):
+    """Block op for decoders; one output per input value."""
+    patterns = _select_patterns(num_inputs, 2 ** num_inputs)
+    return lambda values: _match_rows(values, patterns)
+
+
+_LANES = np.arange(64, dtype=np.uint64)
+
+
+def _lane_integers(words: np.ndarray) -> np.ndarray:
+    """Quantize (num_blocks, width) bus bit words into (num_blocks, 64) per-lane integers."""
+    bits = (words[:, :, None] >> _LANES) & np.uint64(1)
+    weights = np.arange(words.shape[1], dtype=np.uint64)[None, :, None]
+    return np.bitwise_or.reduce(bits << weights, axis=1)
+
+
+def _lane_words(flags: np.ndarray) -> np.ndarray:
+    """Pack (num_blocks, 64) per-lane booleans back into lane words."""
+    return np.bitwise_or.reduce(flags.astype(np.uint64) << _LANES, axis=1)
+
+
+def _comparator_op(bit_width: int):
+    """Block op for comparators; inputs are A0..An-1 then B0..Bn-1, outputs EQ, GT, LT."""
+    if bit_width <= 64:
+        # Buses fit a native integer: one compare per output
+        def op(values):
+            a = _lane_integers(values[:, :bit_width])
+            b = _lane_integers(values[:, bit_width:])
+            return np.stack((_lane_words(a == b), _lane_words(a > b), _lane_words(a < b)), axis=1)
+        return op
+    
+    def op(values):
+        a = values[:, :bit_width]
+        b = values[:, bit_width:]
+        eq = np.full(len(values), HIGH, dtype=np.uint64)
+        gt = np.zeros(len(values), dtype=np.uint64)
+        lt = np.zeros(len(values), dtype=np.uint64)
+        # The most significant differing bit decides, per lane
+        for i in range(bit_width - 1, -1, -1):
+            gt |= eq & a[:, i] & ~b[:, i]
+            lt |= eq & ~a[:, i] & b[:, i]
+            eq &= ~(a[:, i] ^ b[:, i])
+        return np.stack((eq, gt, lt), axis=1)
+    return op
+
+
+def _half_adder(values):
+    a, b = values[:, 0], values[:, 1]
+    return np.stack((a ^ b, a & b), axis=1)
+
+
+def _full_adder(values):
+    a, b, cin = values[:, 0], values[:, 1], values[:, 2]
+    return np.stack((a ^ b ^ cin, (a & b) | (cin & (a ^ b))), axis=1)
+
+
+def _q_and_complement(state):
+    return np.concatenate((state, ~state), axis=1)
+
+
+# Per kind: next state on a clock edge, from the input words (the clock is
+# always the last input) and the (num_blocks, bits) state; and the output
+# words for a state (Q, Q' for flip-flops, Q0..Qn-1 for registers)
+_FLIPFLOP_OPS = {
+    "dff": (lambda values, state: values[:, :1], _q_and_complement),
+    "jkff": (lambda values, state: (values[:, :1] & ~state) | (~values[:, 1:2] & state),
+             _q_and_complement),
+    "register": (lambda values, state: values[:, :-1], lambda state: state),
+}
+
+
+# Block op factories, called with a representative component of the group
+_BLOCK_OPS = {
+    "mux": lambda component: _mux_op(component.num_inputs, component.num_select),
+    "decoder": lambda component: _decoder_op(component.num_inputs),
+    "comparator": lambda component: _comparator_op(component.bit_width),
+    "half_adder": lambda component: _half_adder,
+    "full_adder": lambda component: _full_adder,
+}
+
+
+def _settle_gates(signals, ops, invert, in_ptr, in_nets, out_nets, first, last, max_iterations):
+    """
+    Evaluate gates first..last-1 of the instruction stream in place until
+    no output changes (or max_iterations passes have run).
+    
+    Gate g reads nets in_nets[in_ptr[g]:in_ptr[g + 1]] and writes out_nets[g].
+    Returns the number of passes taken.
+    """
+    for iteration in range(max_iterations):
+        changed = False
+        for g in range(first, last):
+            start = in_ptr[g]
+            end = in_ptr[g + 1]
+            op = ops[g]
+            acc = signals[in_nets[start]]
+            # One branch per gate; the fan-in loops themselves are branch-free
+            if op == _OP_AND:
+                for k in range(start + 1, end):
+                    acc &= signals[in_nets[k]]
+            elif op == _OP_OR:
+                for k in range(start + 1, end):
+                    acc |= signals[in_nets[k]]
+            elif op == _OP_XOR:
+                for k in range(start + 1, end):
+                    acc ^= signals[in_nets[k]]
+            acc ^= invert[g]
+            if signals[out_nets[g]] != acc:
+                signals[out_nets[g]] = acc
+                changed = True
+        if not changed:
+            return iteration + 1
+    return max_iterations
+
+
+try:
+    # Ahead-of-time build (see build_sim_kernel.py): no JIT warmup at startup
+    from sim_native import settle_gates as _settle_gates_native
+except ImportError:
+    _settle_gates_native = njit(cache=True)(_settle_gates) if njit is not None else None
+
+
+def _changed(bits: np.ndarray, published: Optional[np.ndarray]) -> np.ndarray:
+    """Indices where bits differ from the previously published bits (all if none)."""
+    if published is None:
+        return np.arange(len(bits))
+    return np.flatnonzero(bits != published)
+
+
+class CompiledCircuit:
+    """Structure-of-arrays snapshot of a Circuit used by the simulation hot path."""
+    
+    def __init__(self, circuit: Circuit):
+        self.circuit = circuit
+        self.revision = circuit.revision
+        
+        self._assign_nets()
+        self._build_tables()
+        
+        self.signals = np.zeros(self.num_nets, dtype=np.uint64)
+        self.signals[self._net_high] = HIGH
+        self._previous = np.empty_like(self.signals)  # Scratch copy for convergence checks
+        self._settled = False  # True while the nets hold a fixed point
+        self._prime()
+    
+    def _assign_nets(self):
+        """
+        Merge pins connected by wires into nets and number them.
+        
+        Every pin reachable through wires shares one net index, so a
+        driver's value is visible to all of its fanout as soon as it is
+        written: simulation needs no per-step wire propagation or
+        source-to-sink copy.
+        """
+        pins: List[Pin] = []
+        pin_index: Dict[int, int] = {}
+        for component in self.circuit.components.values():
+            for pin in component.pins.values():
+                pin_index[id(pin)] = len(pins)
+                pins.append(pin)
+        
+        # Union-find over pins, joined by wires
+        parent = list(range(len(pins)))
+        
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+        
+        for wire in self.circuit.wires.values():
+            a = pin_index.get(id(wire.start_pin))
+            b = pin_index.get(id(wire.end_pin))
+            if a is None or b is None:
+                continue
+            root_a, root_b = find(a), find(b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+        
+        roots: Dict[int, int] = {}
+        pin_nets = np.empty(len(pins), dtype=np.int32)
+        for i in range(len(pins)):
+            pin_nets[i] = roots.setdefault(find(i), len(roots))
+        
+        self.num_nets = len(roots)
+        # Two constant nets used to pad gate groups with neutral inputs
+        self._net_low = self.num_nets
+        self._net_high = self.num_nets + 1
+        self.num_nets += 2
+        self._pins = pins
+        self._pin_index = pin_index
+        self._pin_nets = pin_nets
+        
+        # Nets with at least one output pin attached; the others float
+        self.driven = np.zeros(self.num_nets, dtype=bool)
+        for i, pin in enumerate(pins):
+            if pin.pin_type == PinType.OUTPUT:
+                self.driven[pin_nets[i]] = True
+    
+    def net_of(self, pin: Pin) -> int:
+        """Get the net index of a pin."""
+        return int(self._pin_nets[self._pin_index[id(pin)]])
+    
+    def _build_tables(self):
+        """Schedule the components and compile gates into index tables."""
+        self._sources: List[Tuple[Component, list]] = []
+        nodes = []
+        
+        for component in self.circuit.components.values():
+            inputs = [(pin, self.net_of(pin)) for pin in component.get_input_pins()]
+            outputs = [(pin, self.net_of(pin)) for pin in component.get_output_pins()]
+            kind = (_GATE_KINDS.get(type(component)) or _BLOCK_KINDS.get(type(component))
+                    or _FLIPFLOP_KINDS.get(type(component)))
+            if kind is None and not inputs:
+                # Switches, buttons, clocks: evaluated once per step
+                self._sources.append((component, outputs))
+            else:
+                nodes.append((component, kind, inputs, outputs))
+        
+        order, levels = self._schedule(nodes)
+        self._eval_order = [nodes[n][0] for n in order]
+        
+        # Group the schedule by level; within a level nothing depends on
+        # anything else, so gates of one level can be evaluated together
+        by_level: Dict[int, Tuple[list, list, list, list]] = {}
+        for n in order:
+            gates, blocks, flipflops, others = by_level.setdefault(levels[n], ([], [], [], []))
+            kind = nodes[n][1]
+            if kind in _GATE_OPS:
+                gates.append(nodes[n])
+            elif kind in _FLIPFLOP_OPS:
+                flipflops.append(nodes[n])
+            elif kind is not None:
+                blocks.append(nodes[n])
+            else:
+                others.append(nodes[n])
+        
+        self._program = ([], [], [0], [], [])
+        self._plan = []
+        # Input words each component last saw; unchanged inputs skip evaluate()
+        self._input_snapshots: List[Optional[bytes]] = []
+        # Clocked components: (component, clock slot, first state bit, bit count)
+        self._flipflops: List[Tuple[Component, int, int, int]] = []
+        self._ff_seed_bits: List[bool] = []
+        self._ff_clock_net = []  # Clock net of each clocked component
+        pending = []
+        for level in sorted(by_level):
+            gates, blocks, flipflops, others = by_level[level]
+            pending.extend((level, node) for node in gates)
+            if blocks or flipflops or others:
+                self._add_gate_stage(pending)
+                pending = []
+            if blocks:
+                self._add_block_stage(blocks)
+            if flipflops:
+                self._add_flipflop_stage(flipflops)
+            if others:
+                for component, _, inputs, outputs in others:
+                    in_idx = np.array([net for _, net in inputs], dtype=np.int32)
+                    # Inputs on driven nets, by position in in_idx; pins on
+                    # floating nets keep whatever value they were given
+                    pushed = [(k, pin) for k, (pin, net) in enumerate(inputs) if self.driven[net]]
+                    self._plan.append((_STAGE_COMPONENT, component, pushed, outputs,
+                                       in_idx, len(self._input_snapshots)))
+                    self._input_snapshots.append(None)
+        self._add_gate_stage(pending)
+        
+        # Flat instruction stream for the native kernel
+        ops, invert, in_ptr, in_nets, out_nets = self._program
+        self._gate_program = (
+            np.array(ops, dtype=np.int8),
+            np.array(invert, dtype=np.uint64),
+            np.array(in_ptr, dtype=np.int32),
+            np.array(in_nets, dtype=np.int32),
+            np.array(out_nets, dtype=np.int32),
+        )
+        del self._program
+        
+        # Stored bits and last clock levels as lane words, seeded from the components
+        self._ff_state = np.array(
+            [HIGH if bit else LOW for bit in self._ff_seed_bits], dtype=np.uint64)
+        self._ff_last_clock = np.zeros(len(self._flipflops), dtype=np.uint64)
+        self._ff_clock_net = np.array(self._ff_clock_net, dtype=np.int32)
+        del self._ff_seed_bits
+        
+        # Bit position of every state bit within its component and the first
+        # bit of each component, so all stored values pack in one reduceat.
+        # Registers wider than a word are packed in Python instead.
+        self._ff_starts = np.array([first for _, _, first, _ in self._flipflops], dtype=np.intp)
+        self._ff_shift = np.array(
+            [i for _, _, _, width in self._flipflops for i in range(width)], dtype=np.uint64)
+        self._ff_packed = all(width <= 64 for _, _, _, width in self._flipflops)
+        
+        # Write-back tables (struct of arrays): objects to update and their
+        # net columns. Only driven nets are published; floating ones keep
+        # whatever the pins and wires held.
+        driven_pins = [i for i, net in enumerate(self._pin_nets) if self.driven[net]]
+        self._out_pins = [self._pins[i] for i in driven_pins]
+        self._out_pin_net = self._pin_nets[driven_pins]
+        
+        wires = [
+            (wire, self.net_of(wire.start_pin))
+            for wire in self.circuit.wires.values()
+            if id(wire.start_pin) in self._pin_index
+        ]
+        wires = [(wire, net) for wire, net in wires if self.driven[net]]
+        self._wires = [wire for wire, _ in wires]
+        self._wire_net = np.array([net for _, net in wires], dtype=np.int32)
+        
+        # Lane-0 bits last published per table (None: publish everything)
+        self._published_pins: Optional[np.ndarray] = None
+        self._published_wires: Optional[np.ndarray] = None
+    
+    def _schedule(self, nodes: list) -> Tuple[List[int], List[int]]:
+        """
+        Order nodes topologically with Kahn's algorithm.
+        
+        Feedback loops are broken at a stateful component (flip-flop,
+        latch, register) where possible. A loop broken at the data inputs
+        of an edge-triggered component whose clock is already scheduled
+        needs no iteration, however many clocked components the loop holds:
+        they all sample nets settled before the edge and commit only after
+        the pass (see _run_plan()), and the pass that propagates their new
+        outputs finds no new edge. If any other loop had to be broken the
+        circuit is marked cyclic and is settled iteratively.
+        
+        Returns:
+            (evaluation order, level of each node)
+        """
+        readers: Dict[int, List[int]] = {}
+        for n, (_, _, inputs, _) in enumerate(nodes):
+            for _, net in inputs:
+                readers.setdefault(net, []).append(n)
+        
+        writers: Dict[int, List[int]] = {}
+        clock_nets: Dict[int, int] = {}
+        for n, (component, _, inputs, outputs) in enumerate(nodes):
+            for _, net in outputs:
+                writers.setdefault(net, []).append(n)
+            if isinstance(component, _EDGE_TRIGGERED):
+                clock_nets[n] = next(net for pin, net in inputs if pin.name == "CLK")
+        
+        successors: List[set] = [set() for _ in nodes]
+        in_degree = [0] * len(nodes)
+        self.cyclic = False
+        for n, (_, _, _, outputs) in enumerate(nodes):
+            for _, net in outputs:
+                for reader in readers.get(net, ()):
+                    if n in clock_nets and reader in clock_nets and clock_nets[reader] != net:
+                        # Edge-triggered data inputs sample the output from
+                        # before the edge: no ordering needed (shift registers)
+                        continue
+                    if reader == n:
+                        if clock_nets.get(n, net) == net:
+                            self.cyclic = True
+                    elif reader not in successors[n]:
+                        successors[n].add(reader)
+                        in_degree[reader] += 1
+        
+        levels = [0] * len(nodes)
+        placed = [False] * len(nodes)
+        ready = deque(n for n in range(len(nodes)) if in_degree[n] == 0)
+        order: List[int] = []
+        
+        while len(order) < len(nodes):
+            if not ready:
+                # Feedback loop: break it, preferably at stored state
+                pending = [n for n in range(len(nodes)) if not placed[n]]
+                n = next((n for n in pending if n in clock_nets
+                          and all(placed[w] for w in writers.get(clock_nets[n], ()))), None)
+                if n is None:
+                    self.cyclic = True
+                    n = next((n for n in pending if isinstance(nodes[n][0], _STATEFUL)), pending[0])
+                ready.append(n)
+            
+            n = ready.popleft()
+            if placed[n]:
+                continue
+            placed[n] = True
+            order.append(n)
+            
+            for successor in successors[n]:
+                if placed[successor]:
+                    continue
+                levels[successor] = max(levels[successor], levels[n] + 1)
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    ready.append(successor)
+        
+        return order, levels
+    
+    def _add_gate_stage(self, gates: list):
+        """Append (level, gate node) pairs, in schedule order, as one plan stage."""
+        if not gates:
+            return
+        
+        ops, invert, in_ptr, in_nets, out_nets = self._program
+        first = len(out_nets)
+        groups: Dict[Tuple[int, str], Tuple[list, list]] = {}
+        
+        for level, (component, kind, inputs, outputs) in gates:
+            input_nets = [net for _, net in inputs]
+            output = outputs[0][1]
+            
+            in_rows, group_outs = groups.setdefault((level, kind), ([], []))
+            in_rows.append(input_nets)
+            group_outs.append(output)
+            
+            op, mask = _GATE_INSTRUCTIONS[kind]
+            ops.append(op)
+            invert.append(mask)
+            in_nets.extend(input_nets)
+            in_ptr.append(len(in_nets))
+            out_nets.append(output)
+        
+        # Levels are appended in ascending order, so the groups are too.
+        # Rows are padded to the widest fan-in with a constant net holding
+        # the neutral element (HIGH for AND, LOW for OR/XOR), so every kind
+        # is a single rectangular reduction per level.
+        group_list = []
+        for (_, kind), (in_rows, group_outs) in groups.items():
+            fan_in = max(len(row) for row in in_rows)
+            pad = self._net_high if kind in _PAD_HIGH else self._net_low
+            in_idx = np.full((len(group_outs), fan_in), pad, dtype=np.int32)
+            for i, row in enumerate(in_rows):
+                in_idx[i, :len(row)] = row
+            group_list.append((_GATE_OPS[kind], in_idx, np.array(group_outs, dtype=np.int32)))
+        self._plan.append((_STAGE_GATES, group_list, first, len(out_nets)))
+    
+    def _add_block_stage(self, blocks: list):
+        """Append combinational blocks of one level, grouped by kind and size."""
+        groups: Dict[Tuple[str, int], Tuple[Component, list, list]] = {}
+        for component, kind, inputs, outputs in blocks:
+            _, in_rows, out_rows = groups.setdefault((kind, len(inputs)), (component, [], []))
+            in_rows.append([net for _, net in inputs])
+            out_rows.append([net for _, net in outputs])
+        
+        group_list = [
+            (_BLOCK_OPS[kind](component),
+             np.array(in_rows, dtype=np.int32),
+             np.array(out_rows, dtype=np.int32))
+            for (kind, _), (component, in_rows, out_rows) in groups.items()
+        ]
+        self._plan.append((_STAGE_BLOCKS, group_list))
+    
+    def _add_flipflop_stage(self, flipflops: list):
+        """Append clocked components of one level, grouped by kind and width, with their state slots."""
+        groups: Dict[Tuple[str, int], Tuple[list, list, list, list]] = {}
+        for component, kind, inputs, outputs in flipflops:
+            if isinstance(component, Register):
+                seed = [(component.value >> i) & 1 == 1 for i in range(component.bit_width)]
+            else:
+                seed = [component.state]
+            
+            in_rows, out_rows, clock_slots, bit_slots = groups.setdefault(
+                (kind, len(seed)), ([], [], [], []))
+            in_rows.append([net for _, net in inputs])
+            out_rows.append([net for _, net in outputs])
+            first = len(self._ff_seed_bits)
+            clock_slots.append(len(self._flipflops))
+            bit_slots.append(list(range(first, first + len(seed))))
+            self._flipflops.append((component, len(self._flipflops), first, len(seed)))
+            self._ff_seed_bits.extend(seed)
+            self._ff_clock_net.append(inputs[-1][1])
+        
+        group_list = [
+            _FLIPFLOP_OPS[kind] + (
+                np.array(in_rows, dtype=np.int32),
+                np.array(out_rows, dtype=np.int32),
+                np.array(clock_slots, dtype=np.int32),
+                np.array(bit_slots, dtype=np.int32))
+            for (kind, _), (in_rows, out_rows, clock_slots, bit_slots) in groups.items()
+        ]
+        self._plan.append((_STAGE_FLIPFLOPS, group_list))
+    
+    def reset(self):
+        """Reset all nets to low; pins and wires read unknown until the next step."""
+        self.signals.fill(LOW)
+        self.signals[self._net_high] = HIGH
+        
+        unknown = Signal.UNKNOWN
+        for pin in self._pins:
+            pin.set_signal(unknown)
+        for wire in self.circuit.wires.values():
+            wire.signal = unknown
+        self._prime()
+        
+        self._input_snapshots = [None] * len(self._input_snapshots)
+        self._published_pins = None
+        self._published_wires = None
+        self._settled = False
+    
+    def set_pin(self, pin: Pin, value: bool):
+        """Force the net of a pin to a value."""
+        if id(pin) in self._pin_index:
+            self.signals[self.net_of(pin)] = HIGH if value else LOW
+            self._settled = False
+    
+    def evaluate_lanes(self, lanes: List[Tuple[Pin, int]]) -> np.ndarray:
+        """
+        Settle the gate logic for up to 64 input vectors at once.
+        
+        Args:
+            lanes: (pin, word) pairs; bit i of word is the pin value in lane i
+        
+        Returns:
+            Net words after settling; bit i of each net is its value in lane i.
+            Only gates and combinational blocks are evaluated per lane, other
+            components keep their current outputs. The interactive simulation state is not modified.
+        """
+        signals = self.signals.copy()
+        for pin, word in lanes:
+            signals[self.net_of(pin)] = np.uint64(word)
+        self._settle_logic(signals)
+        return signals
+    
+    def _settle_logic(self, signals: np.ndarray):
+        """Settle gates and combinational blocks only, leaving other components as they are."""
+        previous = self._previous
+        for _ in range(SIM_MAX_PROPAGATION_DEPTH):
+            if self.cyclic:
+                np.copyto(previous, signals)
+            self._run_plan(signals, with_components=False)
+            if not self.cyclic or np.array_equal(previous, signals):
+                break
+    
+    def _prime(self):
+        """
+        Settle the nets from the stored state before the first step, without
+        clocking anything.
+        
+        Clocked outputs always hold the committed state (see _run_plan()), and
+        each last clock level is taken from its clock net, so a clock derived
+        from a flip-flop output does not read as a rising edge on the first step.
+        """
+        signals = self.signals
+        self._drive_flipflops(signals)
+        for _, outputs in self._sources:
+            for pin, net in outputs:
+                signals[net] = HIGH if pin._hi else LOW
+        self._settle_logic(signals)
+        self._ff_last_clock[:] = signals[self._ff_clock_net]
+    
+    def step(self) -> bool:
+        """
+        Execute one simulation step and publish results to the pins.
+        
+        Returns True if any pin or wire signal changed.
+        """
+        if self._drive_sources() or not self._settled:
+            self._settle()
+            return self._write_back()
+        return False
+    
+    def run(self, n_steps: int) -> bool:
+        """Execute several simulation steps, publishing only the final state (see step())."""
+        signals = self.signals
+        clocks = [c for c in self._sources if isinstance(c[0], Clock)]
+        others = [c for c in self._sources if not isinstance(c[0], Clock)]
+        
+        # Clock waveforms are known in advance: index them instead of ticking
+        waves = []
+        for component, outputs in clocks:
+            wave = np.where(component.waveform(n_steps), HIGH, LOW)
+            waves.extend((net, wave) for _, net in outputs)
+        
+        settled_any = False
+        for t in range(n_steps):
+            changed = self._drive_sources(others)
+            for net, wave in waves:
+                if signals[net] != wave[t]:
+                    signals[net] = wave[t]
+                    changed = True
+            
+            if changed or not self._settled:
+                self._settle()
+                settled_any = True
+        
+        for component, _ in clocks:
+            component.advance(n_steps)
+        
+        if settled_any:
+            return self._write_back()
+        return False
+    
+    def _drive_sources(self, sources: list = None) -> bool:
+        """Evaluate the source components; returns True if any output changed."""
+        signals = self.signals
+        changed = False
+        
+        for component, outputs in self._sources if sources is None else sources:
+            component.evaluate()
+            for pin, net in outputs:
+                word = HIGH if pin._hi else LOW
+                if signals[net] != word:
+                    signals[net] = word
+                    changed = True
+        
+        return changed
+    
+    def _run_plan(self, signals: np.ndarray, with_components: bool = True) -> bool:
+        """
+        Run one pass over the schedule.
+        
+        Clocked components only sample during the pass; their new states are
+        committed once it is over. Returns True if any of them was clocked,
+        in which case another pass is needed to propagate the new outputs.
+        """
+        pending = []
+        for stage in self._plan:
+            if stage[0] is _STAGE_GATES:
+                self._evaluate_gates(signals, stage[1], stage[2], stage[3])
+            elif stage[0] is _STAGE_BLOCKS:
+                for op, in_idx, out_idx in stage[1]:
+                    signals[out_idx] = op(signals[in_idx])
+            elif stage[0] is _STAGE_FLIPFLOPS:
+                if with_components:
+                    self._sample_flipflops(signals, stage[1], pending)
+            elif with_components:
+                values = signals[stage[4]]
+                snapshot = values.tobytes()
+                if snapshot != self._input_snapshots[stage[5]]:
+                    self._input_snapshots[stage[5]] = snapshot
+                    self._evaluate_component(stage[1], stage[2], stage[3], values)
+        
+        for group, state in pending:
+            self._commit_flipflops(signals, group, state)
+        return bool(pending)
+    
+    def _sample_flipflops(self, signals: np.ndarray, groups: list, pending: list):
+        """
+        Clock a stage of flip-flops and registers. Edges of a whole group are
+        found with one op, rising = ~last_clock & clock, per lane; groups with
+        an edge append (group, next state) to pending without touching their
+        outputs, so every clocked component samples pre-edge values.
+        """
+        for group in groups:
+            next_state, _, in_idx, _, clock_slots, bit_slots = group
+            values = signals[in_idx]
+            clock = values[:, -1]
+            rising = (~self._ff_last_clock[clock_slots] & clock)[:, None]
+            self._ff_last_clock[clock_slots] = clock
+            
+            if rising.any():
+                state = self._ff_state[bit_slots]
+                pending.append((group, (state & ~rising) | (next_state(values, state) & rising)))
+    
+    def _commit_flipflops(self, signals: np.ndarray, group: tuple, state: np.ndarray):
+        """Store the states of a group of clocked components and drive their outputs."""
+        _, outputs, _, out_idx, _, bit_slots = group
+        self._ff_state[bit_slots] = state
+        signals[out_idx] = outputs(state)
+    
+    def _drive_flipflops(self, signals: np.ndarray):
+        """Drive the outputs of all clocked components from their stored state."""
+        for stage in self._plan:
+            if stage[0] is _STAGE_FLIPFLOPS:
+                for group in stage[1]:
+                    self._commit_flipflops(signals, group, self._ff_state[group[5]])
+    
+    def _evaluate_gates(self, signals: np.ndarray, groups: list, first: int, last: int) -> int:
+        """Evaluate one stage of topologically ordered gates; returns the passes taken."""
+        if _settle_gates_native is not None:
+            passes = SIM_MAX_PROPAGATION_DEPTH if self.cyclic else 1
+            return _settle_gates_native(signals, *self._gate_program, first, last, passes)
+        
+        for op, in_idx, out_idx in groups:
+            signals[out_idx] = op(signals[in_idx])
+        return 1
+    
+    def _settle(self):
+        """Evaluate all components until the signals reach a steady state."""
+        signals = self.signals
+        
+        self._settled = True
+        
+        if not self.cyclic:
+            # Topological order: a single pass is exact, plus one more pass
+            # per wave of clocked components (ripple clocks fire in turn)
+            for _ in range(SIM_MAX_PROPAGATION_DEPTH):
+                if not self._run_plan(signals):
+                    return
+        else:
+            if (_settle_gates_native is not None and len(self._plan) == 1
+                    and self._plan[0][0] is _STAGE_GATES):
+                # Gates only: the native kernel runs the fixed-point loop itself
+                stage = self._plan[0]
+                if self._evaluate_gates(signals, stage[1], stage[2], stage[3]) < SIM_MAX_PROPAGATION_DEPTH:
+                    return
+            
+            previous = self._previous
+            for _ in range(SIM_MAX_PROPAGATION_DEPTH):
+                np.copyto(previous, signals)
+                self._run_plan(signals)
+                # One vectorized compare-and-reduce over the whole net buffer
+                if not (signals != previous).any():
+                    return
+        
+        self._settled = False
+        log.warning("Simulation did not converge after %d iterations", SIM_MAX_PROPAGATION_DEPTH)
+    
+    def _evaluate_component(self, component: Component, inputs: list, outputs: list,
+                            values: np.ndarray):
+        """
+        Evaluate a component that has no vectorized implementation.
+        
+        inputs holds (position in values, pin) for the pins to update from
+        values, the words already gathered from the component's input nets.
+        """
+        signals = self.signals
+        
+        bits = (values & 1).tolist()
+        for k, pin in inputs:
+            pin.set_bit(bits[k])
+        
+        try:
+            component.evaluate()
+        except Exception:
+            log.exception("Error evaluating component %s", component.id)
+            return
+        
+        for pin, net in outputs:
+            signals[net] = HIGH if pin._hi else LOW
+    
+    def _write_back(self) -> bool:
+        """Copy net values back into pin and wire signals for the UI; returns True if any changed."""
+        signals = self.signals
+        
+        # One gather per table; only pins and wires whose bit changed since
+        # the last write-back are touched
+        bits = signals[self._out_pin_net] & 1
+        changed = _changed(bits, self._published_pins)
+        published = changed.size > 0
+        pins = self._out_pins
+        for i, value in zip(changed.tolist(), bits[changed].tolist()):
+            pins[i].set_bit(value)
+        self._published_pins = bits
+        
+        bits = signals[self._wire_net] & 1
+        changed = _changed(bits, self._published_wires)
+        published = published or changed.size > 0
+        wires = self._wires
+        for i, value in zip(changed.tolist(), bits[changed].tolist()):
+            wires[i].signal = Signal.from_bool(value)
+        self._published_wires = bits
+        
+        if not self._flipflops:
+            return published
+        
+        clocks = (self._ff_last_clock & 1).tolist()
+        if self._ff_packed:
+            values = np.bitwise_or.reduceat(
+                (self._ff_state & 1) << self._ff_shift, self._ff_starts).tolist()
+        else:
+            bits = (self._ff_state & 1).tolist()
+            values = [sum(bit << i for i, bit in enumerate(bits[first:first + width]))
+                      for _, _, first, width in self._flipflops]
+        for (component, clock_slot, _, _), value in zip(self._flipflops, values):
+            component.last_clock = clocks[clock_slot]
+            if isinstance(component, Register):
+                component.value = value
+            else:
+                component.state = value == 1
+        return published
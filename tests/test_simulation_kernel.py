@@ -0,0 +1,140 @@
+"""
+Tests for the compiled simulation kernel.
+"""
+import unittest
+
+from circuit_model import Circuit, SignalState, Wire
+from components.gates import BufferGate, NOTGate
+from components.io import Clock, Switch
+from components.memory import DFlipFlop, Register
+
+
+def connect(circuit: Circuit, source, sink):
+    """Wire an output pin to an input pin."""
+    circuit.add_wire(Wire("", source, sink))
+
+
+class ClockedComponentTest(unittest.TestCase):
+    """Clocked components sample their inputs from before the edge."""
+    
+    def test_dff_chain_shifts_one_stage_per_edge(self):
+        circuit = Circuit()
+        switch, clock = Switch(), Clock()
+        first, second = DFlipFlop(), DFlipFlop()
+        for component in (switch, clock, first, second):
+            circuit.add_component(component)
+        switch.state = True
+        connect(circuit, switch.get_pin("out"), first.get_pin("D"))
+        connect(circuit, first.get_pin("Q"), second.get_pin("D"))
+        for ff in (first, second):
+            connect(circuit, clock.get_pin("out"), ff.get_pin("CLK"))
+        
+        compiled = circuit.compile()
+        compiled.step()  # Rising edge
+        self.assertEqual((first.state, second.state), (True, False))
+        compiled.step()  # Falling edge
+        compiled.step()  # Rising edge
+        self.assertEqual((first.state, second.state), (True, True))
+    
+    def test_dff_chain_through_gate_shifts_one_stage_per_edge(self):
+        circuit = Circuit()
+        switch, clock, buffer = Switch(), Clock(), BufferGate()
+        first, second = DFlipFlop(), DFlipFlop()
+        for component in (switch, clock, buffer, first, second):
+            circuit.add_component(component)
+        switch.state = True
+        connect(circuit, switch.get_pin("out"), first.get_pin("D"))
+        connect(circuit, first.get_pin("Q"), buffer.get_pin("in0"))
+        connect(circuit, buffer.get_pin("out"), second.get_pin("D"))
+        for ff in (first, second):
+            connect(circuit, clock.get_pin("out"), ff.get_pin("CLK"))
+        
+        compiled = circuit.compile()
+        compiled.step()
+        self.assertEqual((first.state, second.state), (True, False))
+        self.assertEqual(second.get_pin("D").signal.state, SignalState.HIGH)
+        compiled.step()
+        compiled.step()
+        self.assertEqual((first.state, second.state), (True, True))
+    
+    def test_ripple_counter_counts_from_first_edge(self):
+        circuit = Circuit()
+        clock = Clock()
+        bits = [DFlipFlop() for _ in range(3)]
+        circuit.add_component(clock)
+        for ff in bits:
+            circuit.add_component(ff)
+            connect(circuit, ff.get_pin("Q'"), ff.get_pin("D"))
+        connect(circuit, clock.get_pin("out"), bits[0].get_pin("CLK"))
+        for previous, ff in zip(bits, bits[1:]):
+            connect(circuit, previous.get_pin("Q'"), ff.get_pin("CLK"))
+        
+        compiled = circuit.compile()
+        counts = []
+        for _ in range(8):
+            compiled.step()
+            compiled.step()
+            counts.append(sum(ff.state << i for i, ff in enumerate(bits)))
+        self.assertEqual(counts, [1, 2, 3, 4, 5, 6, 7, 0])
+
+    
+    def _register_pipeline(self, sink_factory):
+        """Switch -> 2-bit register -> sink, all on one clock; returns (compiled, register, sink)."""
+        circuit = Circuit()
+        switch, clock = Switch(), Clock()
+        register, sink = Register(bit_width=2), sink_factory()
+        for component in (switch, clock, register, sink):
+            circuit.add_component(component)
+        switch.state = True
+        connect(circuit, switch.get_pin("out"), register.get_pin("D0"))
+        connect(circuit, switch.get_pin("out"), register.get_pin("D1"))
+        connect(circuit, register.get_pin("Q0"), sink.get_pin("D0" if isinstance(sink, Register) else "D"))
+        if isinstance(sink, Register):
+            connect(circuit, register.get_pin("Q1"), sink.get_pin("D1"))
+        for component in (register, sink):
+            connect(circuit, clock.get_pin("out"), component.get_pin("CLK"))
+        return circuit.compile(), register, sink
+    
+    def test_register_chain_shifts_one_stage_per_edge(self):
+        compiled, first, second = self._register_pipeline(lambda: Register(bit_width=2))
+        compiled.step()
+        self.assertEqual((first.value, second.value), (3, 0))
+        compiled.step()
+        compiled.step()
+        self.assertEqual((first.value, second.value), (3, 3))
+    
+    def test_register_feeding_dff_shifts_one_stage_per_edge(self):
+        compiled, register, ff = self._register_pipeline(DFlipFlop)
+        compiled.step()
+        self.assertEqual((register.value, ff.state), (3, False))
+        compiled.step()
+        compiled.step()
+        self.assertEqual((register.value, ff.state), (3, True))
+
+    
+    def test_two_flipflops_in_one_loop(self):
+        # Twisted ring: Q1 -> NOT -> D2, Q2 -> BUF -> D1, one clock
+        circuit = Circuit()
+        clock, inverter, buffer = Clock(), NOTGate(), BufferGate()
+        first, second = DFlipFlop(), DFlipFlop()
+        for component in (clock, inverter, buffer, first, second):
+            circuit.add_component(component)
+        connect(circuit, first.get_pin("Q"), inverter.get_pin("in0"))
+        connect(circuit, inverter.get_pin("out"), second.get_pin("D"))
+        connect(circuit, second.get_pin("Q"), buffer.get_pin("in0"))
+        connect(circuit, buffer.get_pin("out"), first.get_pin("D"))
+        for ff in (first, second):
+            connect(circuit, clock.get_pin("out"), ff.get_pin("CLK"))
+        
+        compiled = circuit.compile()
+        self.assertFalse(compiled.cyclic)
+        states = []
+        for _ in range(4):
+            compiled.step()
+            compiled.step()
+            states.append((first.state, second.state))
+        self.assertEqual(states, [(False, True), (True, True), (True, False), (False, False)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 """
 Calculator tab for boolean function analysis.
 """
+import asyncio
 import flet as ft
 from typing import Optional, Callable
 from utils.boolean_algebra import analyze_boolean_function, generate_truth_table
+from utils.constants import TRUTH_TABLE_PAGE_ROWS, CALC_INPUT_UPDATE_DELAY_MS
 
 
 class CalculatorTab:
@@ -12,6 +14,10 @@ class CalculatorTab:
     def __init__(self, on_build_circuit: Optional[Callable] = None):
         self.on_build_circuit = on_build_circuit
         self.current_result = None
+        self._calc_in_flight = False  # An analysis is running in a worker thread
+        self._calc_pending: Optional[str] = None  # Expression submitted while one was running
+        self._input_update_pending = False  # An expression field update is scheduled
+        self._table_vars = None  # Variables the truth table columns were built for
         
         # Input field
         self.expression_input = ft.TextField(
@@ -58,6 +64,24 @@ class CalculatorTab:
             horizontal_lines=ft.BorderSide(1, ft.Colors.GREY_300),
         )
         
+        # Pager for tables longer than one page
+        self.table_page = 0
+        self.page_text = ft.Text("", size=12, color=ft.Colors.GREY_400)
+        self.prev_page_btn = ft.IconButton(
+            ft.Icons.CHEVRON_LEFT,
+            on_click=lambda e: self._turn_table_page(-1),
+            tooltip="Предыдущие строки",
+        )
+        self.next_page_btn = ft.IconButton(
+            ft.Icons.CHEVRON_RIGHT,
+            on_click=lambda e: self._turn_table_page(1),
+            tooltip="Следующие строки",
+        )
+        self.table_pager = ft.Row(
+            controls=[self.prev_page_btn, self.page_text, self.next_page_btn],
+            visible=False,
+        )
+        
         self.truth_table_container = ft.Container(
             content=ft.Column(
                 controls=[
@@ -68,6 +92,7 @@ class CalculatorTab:
                         padding=10,
                         border_radius=5,
                     ),
+                    self.table_pager,
                 ],
                 spacing=10,
             ),
@@ -163,14 +188,28 @@ class CalculatorTab:
         self.expression_input.value = e.control.value
 
     def insert_operator(self, operator: str):
-        """Insert operator at cursor position."""
+        """Insert operator at cursor position; rapid clicks share one UI update."""
         current = self.expression_input.value or ""
         self.expression_input.value = current + operator
+        
+        if self._input_update_pending:
+            return
+        page = self.expression_input.page
+        if page is None:
+            self.expression_input.update()
+            return
+        self._input_update_pending = True
+        page.run_task(self._flush_expression_input)
+    
+    async def _flush_expression_input(self):
+        """Send the expression field to the client once the click burst is over."""
+        await asyncio.sleep(CALC_INPUT_UPDATE_DELAY_MS / 1000)
+        self._input_update_pending = False
         self.expression_input.update()
         # self.expression_input.focus()  # Removed to prevent language reset issues
     
-    def calculate(self, e):
-        """Calculate truth table and forms."""
+    async def calculate(self, e):
+        """Calculate truth table and forms (the analysis runs off the UI thread)."""
         expression = self.expression_input.value
         
         if not expression:
@@ -179,9 +218,33 @@ class CalculatorTab:
             self.status_text.update()
             return
         
+        if self._calc_in_flight:
+            # Analyzed as soon as the running analysis is done
+            self._calc_pending = expression
+            self.status_text.value = "⏳ Идёт вычисление, новая функция будет вычислена следом"
+            self.status_text.color = ft.Colors.ORANGE
+            self.status_text.update()
+            return
+        
         try:
-            # Analyze function
-            result = analyze_boolean_function(expression)
+            # Analyze function; the truth table is O(2^n), keep the UI responsive.
+            # A result made stale by a newer submission is dropped unseen.
+            self._calc_in_flight = True
+            try:
+                while True:
+                    try:
+                        result = await asyncio.to_thread(analyze_boolean_function, expression)
+                        error = None
+                    except Exception as ex:
+                        result, error = None, ex
+                    newer = self._newer_submission(expression)
+                    if newer is None:
+                        break
+                    expression = newer
+            finally:
+                self._calc_in_flight = False
+            if error is not None:
+                raise error
             self.current_result = result
             
             # Update truth table
@@ -199,13 +262,8 @@ class CalculatorTab:
             self.status_text.value = f"✓ Успешно вычислено для {len(result['variables'])} переменных. Схема построена!"
             self.status_text.color = ft.Colors.GREEN
             
-            # Update UI
-            self.truth_table_container.update()
-            self.results_container.update()
-            self.pdnf_text.update()
-            self.pcnf_text.update()
-            self.zhegalkin_text.update()
-            self.status_text.update()
+            # Update UI: one round-trip for the whole tab
+            self.container.update()
             
             # Automatically build circuit from PDNF
             if self.on_build_circuit:
@@ -220,44 +278,71 @@ class CalculatorTab:
             self.status_text.color = ft.Colors.RED
             self.status_text.update()
     
+    def _newer_submission(self, expression: str) -> Optional[str]:
+        """Take the expression submitted during an analysis, if it differs from the analyzed one."""
+        pending, self._calc_pending = self._calc_pending, None
+        return pending if pending and pending != expression else None
+    
     def _update_truth_table(self, result):
-        """Update truth table display."""
+        """Update truth table display, starting at its first page."""
+        variables = tuple(result['variables'])
+        
+        # Create columns, unless the variables are the same as last time
+        if variables != self._table_vars:
+            bold = ft.FontWeight.BOLD
+            columns = [ft.DataColumn(ft.Text(var, weight=bold)) for var in variables]
+            columns.append(ft.DataColumn(ft.Text("F", weight=bold)))
+            self.truth_table.columns = columns
+            self._table_vars = variables
+        
+        self.table_page = 0
+        self._show_table_page(result, update=False)
+    
+    def _turn_table_page(self, delta: int):
+        """Show the previous (-1) or next (+1) page of the truth table."""
+        if self.current_result:
+            self.table_page += delta
+            self._show_table_page(self.current_result)
+    
+    def _show_table_page(self, result, update: bool = True):
+        """Fill the truth table with the rows of the current page only."""
         variables = result['variables']
         truth_table = result['truth_table']
         
-        # Create columns
-        columns = [ft.DataColumn(ft.Text(var, weight=ft.FontWeight.BOLD)) for var in variables]
-        columns.append(ft.DataColumn(ft.Text("F", weight=ft.FontWeight.BOLD)))
+        pages = max(1, -(-len(truth_table) // TRUTH_TABLE_PAGE_ROWS))
+        self.table_page = min(max(self.table_page, 0), pages - 1)
+        first = self.table_page * TRUTH_TABLE_PAGE_ROWS
+        page_rows = truth_table[first:first + TRUTH_TABLE_PAGE_ROWS]
+        
+        bold = ft.FontWeight.BOLD
+        green, grey, highlight = ft.Colors.GREEN, ft.Colors.GREY, ft.Colors.GREEN_100
+        
+        def output_cell(output) -> ft.DataCell:
+            """Output cell; only rows with F = 1 get the highlighted container."""
+            if not output:
+                return ft.DataCell(ft.Text("0", weight=bold, color=grey))
+            return ft.DataCell(ft.Container(
+                content=ft.Text("1", weight=bold, color=green),
+                bgcolor=highlight,
+                padding=5,
+                border_radius=3,
+            ))
         
         # Create rows
-        rows = []
-        for row_data in truth_table:
-            cells = []
-            for var in variables:
-                value = row_data[var]
-                cells.append(ft.DataCell(ft.Text(str(int(value)))))
-            
-            # Output cell with color
-            output = row_data['F']
-            output_cell = ft.DataCell(
-                ft.Container(
-                    content=ft.Text(
-                        str(int(output)),
-                        weight=ft.FontWeight.BOLD,
-                        color=ft.Colors.GREEN if output else ft.Colors.GREY,
-                    ),
-                    bgcolor=ft.Colors.GREEN_100 if output else None,
-                    padding=5,
-                    border_radius=3,
-                )
-            )
-            cells.append(output_cell)
-            
-            rows.append(ft.DataRow(cells=cells))
+        rows = [
+            ft.DataRow(cells=[ft.DataCell(ft.Text("1" if row_data[var] else "0")) for var in variables]
+                       + [output_cell(row_data['F'])])
+            for row_data in page_rows
+        ]
         
-        self.truth_table.columns = columns
         self.truth_table.rows = rows
-        self.truth_table.update()
+        self.table_pager.visible = pages > 1
+        self.page_text.value = f"Строки {first + 1}–{first + len(page_rows)} из {len(truth_table)}"
+        self.prev_page_btn.disabled = self.table_page == 0
+        self.next_page_btn.disabled = self.table_page == pages - 1
+        
+        if update:
+            self.truth_table_container.update()
     
     def clear(self, e):
         """Clear all fields."""
@@ -267,10 +352,7 @@ class CalculatorTab:
         self.status_text.value = "Введите булеву функцию и нажмите 'Вычислить'"
         self.status_text.color = ft.Colors.GREY_400
         
-        self.expression_input.update()
-        self.truth_table_container.update()
-        self.results_container.update()
-        self.status_text.update()
+        self.container.update()
     
     def build_from_pdnf(self, e):
         """Build circuit from PDNF."""
@@ -1,14 +1,45 @@
 """
 Circuit canvas for drawing and interacting with circuits.
 """
+import logging
 import flet as ft
+import flet.canvas as cv
+import numpy as np
 from typing import Optional, Tuple
-from circuit_model import Circuit, Component
+from circuit_model import Circuit, Component, SignalState
 from components.io import Switch, Button, LED
+from components.registry import ComponentRegistry
 from simulation_engine import SimulationEngine
-from utils.geometry import Point, Rect, snap_to_grid
+from utils.geometry import Point, SpatialIndex, route_wires_batch, snap_to_grid
 from utils.constants import *
 
+log = logging.getLogger(__name__)
+
+# Outline of every component body (shared: borders are plain values)
+_BODY_BORDER = ft.border.all(2, COLOR_COMPONENT_STROKE)
+
+# Body fill by exact component class, for components drawn in their state's
+# colour; everything else uses COLOR_COMPONENT_FILL
+_STATE_COLORS = {
+    LED: lambda component: COLOR_LED_ON if component.lit else COLOR_LED_OFF,
+    Switch: lambda component: COLOR_WIRE_ON if component.state else COLOR_WIRE_OFF,
+    Button: lambda component: COLOR_WIRE_ON if component.pressed else COLOR_WIRE_OFF,
+}
+
+# Body corner radius by exact component class (LEDs are circles, sized at layout)
+_BORDER_RADIUS = {Switch: 5}
+
+# Wire colour by signal state; any other state is drawn as unknown
+_WIRE_COLOR = {SignalState.HIGH: COLOR_WIRE_ON, SignalState.LOW: COLOR_WIRE_OFF}
+
+# Paints are plain values too, so one per wire colour (and one for the
+# origin marker) is shared by every redraw
+_WIRE_PAINTS = {
+    color: ft.Paint(stroke_width=2, style=ft.PaintingStyle.STROKE, color=color)
+    for color in (COLOR_WIRE_OFF, COLOR_WIRE_UNKNOWN, COLOR_WIRE_ON)
+}
+_ORIGIN_PAINT = ft.Paint(color="red", stroke_width=2)
+
 
 class CircuitCanvas:
     """Interactive canvas for circuit editing."""
@@ -30,9 +61,34 @@ class CircuitCanvas:
         self.pan_start_x = 0
         self.pan_start_y = 0
         
-        # Create canvas container with gesture detector
-        self.canvas_stack = ft.Stack(
+        # Hit-test index over component bounds, rebuilt when the circuit changes
+        self._index: Optional[SpatialIndex] = None
+        self._index_key = None
+        
+        # Retained scene: controls per component, rebuilt when the circuit changes
+        self._scene_key = None
+        self._scene_view = None
+        self._static_canvas = None  # Grid and wires share one canvas
+        self._grid_shapes = []
+        self._component_controls = {}
+        self._stateful_controls = []
+        self._component_bounds = np.zeros((0, 4))
+        self._wires = []
+        self._wire_routes = np.zeros((0, 4, 2))
+        self._wire_paths = []
+        
+        # Create canvas container with gesture detector; everything drawn
+        # lives in one scene layer that a pan drag can move as a whole
+        self._scene = ft.Stack(
             controls=[],
+            left=0,
+            top=0,
+            width=self.canvas_width,
+            height=self.canvas_height,
+            clip_behavior=ft.ClipBehavior.NONE,
+        )
+        self.canvas_stack = ft.Stack(
+            controls=[self._scene],
             width=self.canvas_width,
             height=self.canvas_height,
         )
@@ -107,6 +163,8 @@ class CircuitCanvas:
         
         self.canvas_stack.width = width
         self.canvas_stack.height = height
+        self._scene.width = width
+        self._scene.height = height
         
         self.canvas_container.width = width
         self.canvas_container.height = height
@@ -136,36 +194,38 @@ class CircuitCanvas:
             # Handle interactive components
             if isinstance(clicked_component, Switch):
                 clicked_component.toggle()
-                self.simulation.step()
-                self.simulation.step()
-                self.simulation.step()
-                self.update_canvas()
+                self.simulation.step(3)
+                self.update_signals()
             elif isinstance(clicked_component, Button):
                 clicked_component.press()
-                self.simulation.step()
-                self.simulation.step()
-                self.simulation.step()
-                self.update_canvas()
+                self.simulation.step(3)
+                self.update_signals()
     
     def find_component_at(self, x: float, y: float) -> Optional[Component]:
         """Find component at given coordinates."""
-        point = Point(x, y)
-        
-        for component in self.circuit.components.values():
-            bounds = component.get_bounds()
-            rect = Rect(bounds[0], bounds[1], bounds[2], bounds[3])
-            if rect.contains_point(point):
-                return component
-        
-        return None
+        hits = self._component_index().query_point(x, y)
+        return hits[0] if hits else None
+    
+    def _component_index(self) -> SpatialIndex:
+        """Spatial index of component bounds for the current circuit revision."""
+        key = self._circuit_key()
+        if self._index is None or self._index_key != key:
+            index = SpatialIndex(CANVAS_INDEX_CELL_SIZE)
+            for component in self.circuit.components.values():
+                index.insert(component, *component.get_bounds())
+            self._index = index
+            self._index_key = key
+        return self._index
+    
+    def _circuit_key(self) -> tuple:
+        """Identifies the current circuit and structural revision."""
+        return (id(self.circuit), self.circuit.revision)
     
     def place_component(self, x: float, y: float):
         """Place a new component."""
         if not self.component_to_place:
             return
         
-        from components.registry import ComponentRegistry
-        
         # Snap to grid
         if GRID_SNAP:
             x, y = snap_to_grid(x, y, GRID_SIZE)
@@ -176,7 +236,12 @@ class CircuitCanvas:
                 label=self.component_to_place.upper(),
                 position=Point(x, y)
             )
+            # Keep an up-to-date hit-test index current instead of rebuilding it
+            index_current = self._index is not None and self._index_key == self._circuit_key()
             self.circuit.add_component(component)
+            if index_current:
+                self._index.insert(component, *component.get_bounds())
+                self._index_key = self._circuit_key()
             self.component_to_place = None
             self.update_canvas()
         except Exception as e:
@@ -186,157 +251,205 @@ class CircuitCanvas:
         """Set the component type to place on next click."""
         self.component_to_place = component_type
     
-    def update_canvas(self):
-        """Redraw the canvas."""
-        print(f"DEBUG: update_canvas called. Components: {len(self.circuit.components)}, Wires: {len(self.circuit.wires)}")
-        self.canvas_stack.controls.clear()
-        
-        # 1. Draw Grid (Background)
-        self._draw_grid()
+    def update_canvas(self, update: bool = True):
+        """
+        Redraw the canvas (sent to the client unless update is False).
+        
+        Controls are created once per circuit revision and then updated in
+        place, so Flet only sends the properties that actually changed.
+        """
+        log.debug("update_canvas called. Components: %d, Wires: %d",
+                  len(self.circuit.components), len(self.circuit.wires))
+        key = self._circuit_key()
+        if key != self._scene_key:
+            self._build_scene()
+            self._scene_key = key
+        
+        # Zoom and pan only move the existing controls
+        view = (self.zoom, self.offset_x, self.offset_y)
+        if view != self._scene_view:
+            self._draw_grid()
+            self._layout_components()
+            self._layout_wires()
+            self._scene_view = view
+            self._scene.left = 0
+            self._scene.top = 0
+        
+        self._refresh_signals()
+        if update:
+            self.canvas_stack.update()
+        log.debug("Canvas updated")
+    
+    def update_signals(self):
+        """Redraw after a simulation step: only wire and component state colours change."""
+        if self._scene_key != self._circuit_key():
+            self.update_canvas()
+            return
         
-        # 2. Draw Wires (Middle Layer)
+        self._refresh_signals()
+        self.canvas_stack.update()
+    
+    def _refresh_signals(self):
+        """Recolour wires and LEDs, switches and buttons from their current state."""
         self._draw_wires()
+        for component, body, state_color in self._stateful_controls:
+            color = state_color(component)
+            if body.bgcolor != color:
+                body.bgcolor = color
+    
+    def _build_scene(self):
+        """Create the layers and one set of controls per component."""
+        self._scene.controls.clear()
+        
+        # 1. Grid (Background) and 2. Wires (Middle Layer), in one canvas
+        self._static_canvas = cv.Canvas(shapes=[], expand=True)
+        self._scene.controls.append(self._static_canvas)
         
-        # 3. Draw Components (Top Layer)
+        # 3. Components (Top Layer)
+        self._component_controls = {}
+        self._stateful_controls = []
         for component in self.circuit.components.values():
             self.render_component(component)
         
-        self.canvas_stack.update()
-        print("DEBUG: Canvas updated")
-
+        # World geometry as arrays, transformed in one go per view:
+        # component bounds (x, y, w, h) in _component_controls order, and
+        # wire paths (four (x, y) points each, routed like route_wire)
+        self._component_bounds = np.array(
+            [component.get_bounds() for component in self._component_controls],
+            dtype=np.float64).reshape(-1, 4)
+        pin_owner = {}
+        for component in self.circuit.components.values():
+            for pin in component.pins.values():
+                pin_owner[id(pin)] = component
+        wires = []
+        wire_ends = []
+        for wire in self.circuit.wires.values():
+            ends = self._wire_endpoints(wire, pin_owner)
+            if ends:
+                wires.append(wire)
+                wire_ends.append(ends)
+        wire_ends = np.array(wire_ends, dtype=np.float64).reshape(-1, 4)
+        
+        # Validate coordinates: wires with an end at or left/above the origin are skipped
+        valid = (wire_ends > 0).all(axis=1)
+        self._wires = [wires[i] for i in np.flatnonzero(valid).tolist()]
+        wire_ends = wire_ends[valid]
+        self._wire_routes = route_wires_batch(wire_ends[:, :2], wire_ends[:, 2:])
+        
+        self._scene_view = None  # Lay everything out on this update
+    
     def _draw_grid(self):
         """Draw background grid."""
-        import flet.canvas as cv
-        
         # Draw origin marker (cross at 0,0)
         screen_x, screen_y = self.world_to_screen(0, 0)
         
-        grid_canvas = cv.Canvas(
-            shapes=[
-                cv.Line(screen_x - 10, screen_y, screen_x + 10, screen_y, paint=ft.Paint(color="red", stroke_width=2)),
-                cv.Line(screen_x, screen_y - 10, screen_x, screen_y + 10, paint=ft.Paint(color="red", stroke_width=2)),
-            ],
-            expand=True,
-        )
-        self.canvas_stack.controls.append(grid_canvas)
-
+        self._grid_shapes = [
+            cv.Line(screen_x - 10, screen_y, screen_x + 10, screen_y, paint=_ORIGIN_PAINT),
+            cv.Line(screen_x, screen_y - 10, screen_x, screen_y + 10, paint=_ORIGIN_PAINT),
+        ]
+    
+    def _layout_wires(self):
+        """Build every wire's routed sub-path for the current zoom and pan."""
+        move_to = cv.Path.MoveTo
+        line_to = cv.Path.LineTo
+        
+        # Apply zoom and offset to all path points at once
+        points = self._wire_routes * self.zoom
+        points[:, :, 0] += self.offset_x
+        points[:, :, 1] += self.offset_y
+        
+        self._wire_paths = [
+            (move_to(*start), line_to(*bend_1), line_to(*bend_2), line_to(*end))
+            for start, bend_1, bend_2, end in points.tolist()
+        ]
+    
     def _draw_wires(self):
-        """Draw all wires."""
-        wire_shapes = []
-        for wire in self.circuit.wires.values():
-            shape = self.create_wire_shape(wire)
-            if shape:
-                wire_shapes.append(shape)
-        
-        if wire_shapes:
-            print(f"DEBUG: Drawing {len(wire_shapes)} wires")
-            import flet.canvas as cv
-            wire_canvas = cv.Canvas(
-                shapes=wire_shapes,
-                expand=True,
-            )
-            self.canvas_stack.controls.append(wire_canvas)
-
+        """Draw the grid and all wires, in one Path per colour."""
+        # Path elements per colour, in drawing order (lit wires on top)
+        buckets = {COLOR_WIRE_OFF: [], COLOR_WIRE_UNKNOWN: [], COLOR_WIRE_ON: []}
+        wire_color = _WIRE_COLOR.get
+        for wire, path in zip(self._wires, self._wire_paths):
+            buckets[wire_color(wire.signal.state, COLOR_WIRE_UNKNOWN)].extend(path)
+        
+        self._static_canvas.shapes = self._grid_shapes + [
+            cv.Path(elements=elements, paint=_WIRE_PAINTS[color])
+            for color, elements in buckets.items()
+            if elements
+        ]
+    
     def render_component(self, component: Component):
-        """Draw a component on the canvas."""
-        bounds = component.get_bounds()
-        x, y, w, h = bounds
-        print(f"DEBUG: Rendering component {component.label} at ({x}, {y}) size ({w}, {h})")
-        
-        # Apply zoom and offset
-        screen_x, screen_y = self.world_to_screen(x, y)
-        screen_w = w * self.zoom
-        screen_h = h * self.zoom
-        
-        # Determine color based on component type and state
-        fill_color = COLOR_COMPONENT_FILL
-        stroke_color = COLOR_COMPONENT_STROKE
-        
-        # Special rendering for different component types
-        if isinstance(component, LED):
-            # Draw LED as circle
-            color = COLOR_LED_ON if component.lit else COLOR_LED_OFF
-            circle = ft.Container(
-                left=screen_x,
-                top=screen_y,
-                width=screen_w,
-                height=screen_h,
-                bgcolor=color,
-                border=ft.border.all(2, stroke_color),
-                border_radius=screen_w // 2,
-            )
-            self.canvas_stack.controls.append(circle)
-        
-        elif isinstance(component, Switch):
-            # Draw switch as rounded rectangle
-            color = COLOR_WIRE_ON if component.state else COLOR_WIRE_OFF
-            switch_rect = ft.Container(
-                left=screen_x,
-                top=screen_y,
-                width=screen_w,
-                height=screen_h,
-                bgcolor=color,
-                border=ft.border.all(2, stroke_color),
-                border_radius=5,
-            )
-            self.canvas_stack.controls.append(switch_rect)
-        
-        elif isinstance(component, Button):
-            # Draw button
-            color = COLOR_WIRE_ON if component.pressed else COLOR_WIRE_OFF
-            button_rect = ft.Container(
-                left=screen_x,
-                top=screen_y,
-                width=screen_w,
-                height=screen_h,
-                bgcolor=color,
-                border=ft.border.all(2, stroke_color),
-                border_radius=3,
-            )
-            self.canvas_stack.controls.append(button_rect)
-        
-        else:
-            # Draw generic component as rectangle
-            comp_rect = ft.Container(
-                left=screen_x,
-                top=screen_y,
-                width=screen_w,
-                height=screen_h,
-                bgcolor=fill_color,
-                border=ft.border.all(2, stroke_color),
-                border_radius=3,
-            )
-            self.canvas_stack.controls.append(comp_rect)
+        """Create the controls for a component; they are laid out by update_canvas."""
+        log.debug("Rendering component %s", component.label)
+        
+        # Special rendering for different component types: LEDs are circles,
+        # switches and buttons rounded rectangles coloured by their state
+        kind = type(component)
+        state_color = _STATE_COLORS.get(kind)
+        body = ft.Container(
+            bgcolor=state_color(component) if state_color else COLOR_COMPONENT_FILL,
+            border=_BODY_BORDER,
+            border_radius=_BORDER_RADIUS.get(kind, 3),
+        )
+        if state_color:
+            self._stateful_controls.append((component, body, state_color))
+        self._scene.controls.append(body)
         
         # Draw label
         label_text = ft.Text(
             component.label,
-            size=max(8, int(10 * self.zoom)),
             color=COLOR_TEXT,
             text_align=ft.TextAlign.CENTER,
         )
-        label_container = ft.Container(
-            content=label_text,
-            left=screen_x,
-            top=screen_y + screen_h + 2,
-            width=screen_w,
-        )
-        self.canvas_stack.controls.append(label_container)
-    def create_wire_shape(self, wire):
-        """Create a shape for a wire."""
-        from circuit_model import SignalState, PinType
-        import flet.canvas as cv
+        label = ft.Container(content=label_text)
+        self._scene.controls.append(label)
         
-        # Get absolute positions of pins
-        start_comp = None
-        end_comp = None
+        self._component_controls[component] = (body, label, kind is LED)
+    
+    def _layout_components(self):
+        """Position all component controls for the current zoom and pan."""
+        # Apply zoom and offset to all bounds at once
+        rects = self._component_bounds * self.zoom
+        rects[:, 0] += self.offset_x
+        rects[:, 1] += self.offset_y
+        
+        # A pan keeps every size: only move the controls
+        if self._scene_view is not None and self._scene_view[0] == self.zoom:
+            for (body, label, _), (screen_x, screen_y, _, screen_h) in zip(
+                    self._component_controls.values(), rects.tolist()):
+                body.left = screen_x
+                body.top = screen_y
+                label.left = screen_x
+                label.top = screen_y + screen_h + 2
+            return
         
+        label_size = max(8, int(10 * self.zoom))
+        
+        # Zoomed out, components are drawn as plain filled boxes: no outline
+        # and no label, which would be unreadable anyway
+        detailed = self.zoom >= CANVAS_DETAIL_MIN_ZOOM
+        border = _BODY_BORDER if detailed else None
+        
+        for (body, label, round_body), (screen_x, screen_y, screen_w, screen_h) in zip(
+                self._component_controls.values(), rects.tolist()):
+            body.left = screen_x
+            body.top = screen_y
+            body.width = screen_w
+            body.height = screen_h
+            body.border = border
+            if round_body:
+                body.border_radius = screen_w // 2
+            
+            label.left = screen_x
+            label.top = screen_y + screen_h + 2
+            label.width = screen_w
+            label.content.size = label_size
+            label.visible = detailed
+    
+    def _wire_endpoints(self, wire, pin_owner: dict):
+        """World coordinates (start_x, start_y, end_x, end_y) of a wire, or None if unconnected."""
         # Find components that own these pins
-        for component in self.circuit.components.values():
-            if wire.start_pin in component.pins.values():
-                start_comp = component
-            if wire.end_pin in component.pins.values():
-                end_comp = component
+        start_comp = pin_owner.get(id(wire.start_pin))
+        end_comp = pin_owner.get(id(wire.end_pin))
         
         if not start_comp or not end_comp:
             return None
@@ -345,45 +458,8 @@ class CircuitCanvas:
         start_bounds = start_comp.get_bounds()
         end_bounds = end_comp.get_bounds()
         
-        start_x = start_bounds[0] + start_bounds[2] / 2
-        start_y = start_bounds[1] + start_bounds[3] / 2
-        end_x = end_bounds[0] + end_bounds[2] / 2
-        end_y = end_bounds[1] + end_bounds[3] / 2
-        
-        # Validate coordinates
-        if start_x <= 0 or start_y <= 0 or end_x <= 0 or end_y <= 0:
-            return None
-        
-        # Apply zoom and offset
-        screen_start_x, screen_start_y = self.world_to_screen(start_x, start_y)
-        screen_end_x, screen_end_y = self.world_to_screen(end_x, end_y)
-        
-        # Determine wire color
-        if wire.signal.state == SignalState.HIGH:
-            color = COLOR_WIRE_ON
-        elif wire.signal.state == SignalState.LOW:
-            color = COLOR_WIRE_OFF
-        else:
-            color = COLOR_WIRE_UNKNOWN
-        
-        # Draw L-shaped wire
-        mid_x = (screen_start_x + screen_end_x) / 2
-        
-        line_path = cv.Path([
-            cv.Path.MoveTo(screen_start_x, screen_start_y),
-            cv.Path.LineTo(mid_x, screen_start_y),
-            cv.Path.LineTo(mid_x, screen_end_y),
-            cv.Path.LineTo(screen_end_x, screen_end_y),
-        ])
-        
-        return cv.Path(
-            elements=line_path.elements,
-            paint=ft.Paint(
-                stroke_width=2,
-                style=ft.PaintingStyle.STROKE,
-                color=color,
-            ),
-        )
+        return (start_bounds[0] + start_bounds[2] / 2, start_bounds[1] + start_bounds[3] / 2,
+                end_bounds[0] + end_bounds[2] / 2, end_bounds[1] + end_bounds[3] / 2)
     
     def clear_canvas(self):
         """Clear the canvas."""
@@ -403,30 +479,25 @@ class CircuitCanvas:
         # Update slider and text
         self.zoom_slider.value = self.zoom * 100
         self.zoom_text.value = f"{int(self.zoom * 100)}%"
-        self.zoom_slider.update()
-        self.zoom_text.update()
-        self.update_canvas()
+        self._update_view()
     
     def zoom_in(self, e):
         """Zoom in."""
         self.zoom = min(self.zoom * 1.2, 3.0)
         self.zoom_text.value = f"Zoom: {int(self.zoom * 100)}%"
-        self.zoom_text.update()
-        self.update_canvas()
+        self._update_view()
     
     def zoom_out(self, e):
         """Zoom out."""
         self.zoom = max(self.zoom / 1.2, 0.3)
         self.zoom_text.value = f"Zoom: {int(self.zoom * 100)}%"
-        self.zoom_text.update()
-        self.update_canvas()
+        self._update_view()
     
     def on_zoom_slider_change(self, e):
         """Handle zoom slider change."""
         self.zoom = e.control.value / 100.0
         self.zoom_text.value = f"{int(self.zoom * 100)}%"
-        self.zoom_text.update()
-        self.update_canvas()
+        self._update_view()
     
     def reset_view(self, e):
         """Reset zoom and pan to default."""
@@ -435,9 +506,12 @@ class CircuitCanvas:
         self.offset_y = 0
         self.zoom_slider.value = 100
         self.zoom_text.value = "100%"
-        self.zoom_slider.update()
-        self.zoom_text.update()
-        self.update_canvas()
+        self._update_view()
+    
+    def _update_view(self):
+        """Send the redrawn canvas and the zoom controls in one update."""
+        self.update_canvas(update=False)
+        self.container.update()
     
     def on_pan_start(self, e):
         """Start panning."""
@@ -459,11 +533,21 @@ class CircuitCanvas:
             dy = e.delta_y
             self.offset_x += dx
             self.offset_y += dy
-            self.update_canvas()
+            
+            # While dragging only the scene layer moves; it is laid out
+            # again for the new offset when the pan ends
+            view = self._scene_view
+            if view is not None and view[0] == self.zoom:
+                self._scene.left = self.offset_x - view[1]
+                self._scene.top = self.offset_y - view[2]
+                self._scene.update()
+            else:
+                self.update_canvas()
     
     def on_pan_end(self, e):
         """End panning."""
         self.is_panning = False
+        self.update_canvas()
     
     def screen_to_world(self, x: float, y: float) -> Tuple[float, float]:
         """Convert screen coordinates to world coordinates."""
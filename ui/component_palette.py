@@ -5,45 +5,56 @@ import flet as ft
 from components.registry import ComponentRegistry
 
 
+def _create_tab_content(components, on_component_selected) -> ft.Container:
+    """Create the button column for one category."""
+    # Create buttons for each component
+    component_buttons = []
+    for comp_type in components:
+        btn = ft.ElevatedButton(
+            text=comp_type.upper(),
+            on_click=lambda e, ct=comp_type: on_component_selected(ct),
+            width=120,
+        )
+        component_buttons.append(btn)
+    
+    # Wrap in a column
+    tab_content = ft.Column(
+        controls=component_buttons,
+        spacing=5,
+        scroll=ft.ScrollMode.AUTO,
+    )
+    
+    return ft.Container(
+        content=tab_content,
+        padding=10,
+    )
+
+
 def create_component_palette(on_component_selected):
-    """Create component selection palette."""
+    """Create component selection palette (a tab's buttons are built when it is first shown)."""
     categories = ComponentRegistry.get_categories()
     
     # Create tabs for each category
-    tabs = []
+    tabs = [ft.Tab(text=category_name) for category_name in categories]
+    components_by_tab = list(categories.values())
     
-    for category_name, components in categories.items():
-        # Create buttons for each component
-        component_buttons = []
-        for comp_type in components:
-            btn = ft.ElevatedButton(
-                text=comp_type.upper(),
-                on_click=lambda e, ct=comp_type: on_component_selected(ct),
-                width=120,
-            )
-            component_buttons.append(btn)
-        
-        # Wrap in a column
-        tab_content = ft.Column(
-            controls=component_buttons,
-            spacing=5,
-            scroll=ft.ScrollMode.AUTO,
-        )
-        
-        tab = ft.Tab(
-            text=category_name,
-            content=ft.Container(
-                content=tab_content,
-                padding=10,
-            )
-        )
-        tabs.append(tab)
+    def fill_tab(index: int):
+        tab = tabs[index]
+        if tab.content is None:
+            tab.content = _create_tab_content(components_by_tab[index], on_component_selected)
+    
+    def on_change(e):
+        fill_tab(tabs_container.selected_index)
+        tabs_container.update()
     
     # Create tabs container
     tabs_container = ft.Tabs(
         tabs=tabs,
+        selected_index=0,
         animation_duration=300,
+        on_change=on_change,
     )
+    fill_tab(0)
     
     return ft.Container(
         content=tabs_container,
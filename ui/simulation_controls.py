@@ -1,8 +1,11 @@
 """
 Simulation controls for running and stepping through simulations.
 """
+import asyncio
+import time
 import flet as ft
 from simulation_engine import SimulationEngine
+from utils.constants import SIM_MAX_FPS, SIM_TICK_RATE_MS
 
 
 class SimulationControls:
@@ -12,6 +15,8 @@ class SimulationControls:
         self.simulation = simulation_engine
         self.on_step_callback = on_step_callback
         self.running = False
+        # Bumped on every start/stop/reset; a run loop exits once it is stale
+        self._generation = 0
         
         # Create UI elements
         self.start_button = ft.ElevatedButton(
@@ -62,29 +67,60 @@ class SimulationControls:
     
     def start_simulation(self, e):
         """Start continuous simulation."""
+        if self.running:
+            return
         self.simulation.start()
         self.running = True
+        self._generation += 1
         self.start_button.disabled = True
         self.stop_button.disabled = False
-        self.start_button.update()
-        self.stop_button.update()
+        self.container.update()
+        
+        self.container.page.run_task(self._run_loop, self._generation)
+    
+    async def _run_loop(self, generation: int):
+        """
+        Step every SIM_TICK_RATE_MS while running; redraw at most SIM_MAX_FPS times a second.
+        
+        The loop stops as soon as generation is stale, so a Stop followed by
+        Start within one tick does not leave the old loop running as well.
+        """
+        frame = 1 / SIM_MAX_FPS
+        last_draw = 0.0
+        changed = False
+        while self._generation == generation:
+            await asyncio.sleep(SIM_TICK_RATE_MS / 1000)
+            if self._generation != generation:
+                break
+            changed = self.simulation.step() or changed
+            
+            # Steps between two frames share one redraw
+            now = time.monotonic()
+            if now - last_draw >= frame:
+                last_draw = now
+                self.tick_text.value = f"Ticks: {self.simulation.tick_count}"
+                self.tick_text.update()
+                if changed and self.on_step_callback:
+                    self.on_step_callback()
+                changed = False
     
     def stop_simulation(self, e):
         """Stop simulation."""
         self.simulation.stop()
         self.running = False
+        self._generation += 1
         self.start_button.disabled = False
         self.stop_button.disabled = True
-        self.start_button.update()
-        self.stop_button.update()
+        self.container.update()
     
     def step_simulation(self, e):
         """Execute one simulation step."""
-        self.simulation.step()
+        changed = self.simulation.step()
         self.tick_text.value = f"Ticks: {self.simulation.tick_count}"
         self.tick_text.update()
         
-        if self.on_step_callback:
+        # Nothing to redraw if no signal changed
+        if changed and self.on_step_callback:
             self.on_step_callback()
     
     def reset_simulation(self, e):
@@ -92,11 +128,10 @@ class SimulationControls:
         self.simulation.reset()
         self.tick_text.value = "Ticks: 0"
         self.running = False
+        self._generation += 1
         self.start_button.disabled = False
         self.stop_button.disabled = True
-        self.tick_text.update()
-        self.start_button.update()
-        self.stop_button.update()
+        self.container.update()
         
         if self.on_step_callback:
             self.on_step_callback()
@@ -1,17 +1,41 @@
 """
 Boolean algebra utilities for truth tables, PDNF, PCNF, and Zhegalkin polynomials.
 """
+import ast
 import re
-from typing import List, Dict, Tuple, Set, Optional
+from typing import List, Dict, Tuple, Set, Optional, Iterator
 from dataclasses import dataclass
+from functools import lru_cache, wraps
 from itertools import product
+import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
 
-@dataclass
+
+@dataclass(slots=True)
 class TruthTableRow:
-    """Single row in a truth table."""
-    inputs: Dict[str, bool]
+    """
+    Single row in a truth table.
+    
+    The inputs are one integer: bit n-1-j of mask is the value of
+    variables[j], so the mask of row r in a full table is r.
+    """
+    mask: int
     output: bool
+    variables: Tuple[str, ...]
+    
+    def get(self, var: str) -> bool:
+        """Value of one input variable."""
+        return bool(self.mask >> (len(self.variables) - 1 - self.variables.index(var)) & 1)
+    
+    @property
+    def inputs(self) -> Dict[str, bool]:
+        """Input values by variable name, built on demand."""
+        n = len(self.variables)
+        return {var: bool(self.mask >> (n - 1 - j) & 1) for j, var in enumerate(self.variables)}
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -24,6 +48,8 @@ class TruthTable:
     def __init__(self, variables: List[str], rows: List[TruthTableRow]):
         self.variables = variables
         self.rows = rows
+        # Normal forms already computed for this table (see _per_table)
+        self._forms: Dict[str, str] = {}
     
     def get_minterms(self) -> List[TruthTableRow]:
         """Get rows where output is True (for PDNF)."""
@@ -33,9 +59,19 @@ class TruthTable:
         """Get rows where output is False (for PCNF)."""
         return [row for row in self.rows if not row.output]
     
+    def iter_dicts(self) -> Iterator[Dict]:
+        """Yield one display dictionary per row without building them all at once."""
+        n = len(self.variables)
+        shifts = [(var, n - 1 - j) for j, var in enumerate(self.variables)]
+        for row in self.rows:
+            mask = row.mask
+            row_dict = {var: bool(mask >> shift & 1) for var, shift in shifts}
+            row_dict['F'] = row.output
+            yield row_dict
+    
     def to_list(self) -> List[Dict]:
         """Convert to list of dictionaries for display."""
-        return [row.to_dict() for row in self.rows]
+        return list(self.iter_dicts())
 
 
 class BooleanExpression:
@@ -51,129 +87,244 @@ class BooleanExpression:
     NAND_OPS = ['↑', 'nand', 'NAND']
     NOR_OPS = ['↓', 'nor', 'NOR']
     
+    # Multi-character spellings, matched longest first in one regex pass
+    # (words only as whole words), and one translation table for all
+    # single-character ones; '~' stays NOT rather than equivalence
+    _MULTI = {
+        op: canonical
+        for ops, canonical in ((IMPL_OPS, '→'), (EQ_OPS, '≡'), (AND_OPS, '&'), (OR_OPS, '|'),
+                               (NOT_OPS, '!'), (XOR_OPS, '^'), (NAND_OPS, '↑'), (NOR_OPS, '↓'))
+        for op in ops if len(op) > 1
+    }
+    _MULTI_RE = re.compile('|'.join(
+        rf'\b{op}\b' if op.isalpha() else re.escape(op)
+        for op in sorted(_MULTI, key=len, reverse=True)
+    ))
+    _SYMBOLS = str.maketrans({
+        op: canonical
+        for ops, canonical in ((EQ_OPS, '≡'), (AND_OPS, '&'), (OR_OPS, '|'), (NOT_OPS, '!'),
+                               (XOR_OPS, '^'), (NAND_OPS, '↑'), (NOR_OPS, '↓'))
+        for op in ops if len(op) == 1 and op != canonical
+    })
+    
     def __init__(self, expression: str):
         self.original = expression
         self.normalized = self._normalize(expression)
         self.variables = self._extract_variables()
+        self._names = {var: f"_v{j}" for j, var in enumerate(self.variables)}
+        self._source, self._code, self._error = None, None, None
+        try:
+            self._source = _to_source(_Parser(self.normalized).parse(), self._names)
+            self._code = compile(self._source, '<expr>', 'eval')
+        except (ValueError, SyntaxError) as e:
+            self._error = e
     
     def _normalize(self, expr: str) -> str:
         """Normalize expression to use standard operators."""
-        expr = expr.strip()
-        
-        # Replace multi-character operators first
-        for op in self.IMPL_OPS:
-            if len(op) > 1:
-                expr = expr.replace(op, '→')
-        
-        for op in self.EQ_OPS:
-            if len(op) > 1:
-                expr = expr.replace(op, '≡')
-        
-        # Replace single character operators
-        for op in self.AND_OPS:
-            if op != '&':
-                expr = expr.replace(op, '&')
-        
-        for op in self.OR_OPS:
-            if op != '|':
-                expr = expr.replace(op, '|')
-        
-        for op in self.NOT_OPS:
-            if op != '!':
-                expr = expr.replace(op, '!')
-        
-        for op in self.XOR_OPS:
-            if op != '^':
-                expr = expr.replace(op, '^')
-        
-        for op in self.NAND_OPS:
-            if op != '↑':
-                expr = expr.replace(op, '↑')
-        
-        for op in self.NOR_OPS:
-            if op != '↓':
-                expr = expr.replace(op, '↓')
-        
-        return expr
+        expr = self._MULTI_RE.sub(lambda match: self._MULTI[match.group(0)], expr.strip())
+        return expr.translate(self._SYMBOLS)
     
     def _extract_variables(self) -> List[str]:
         """Extract variable names from expression."""
-        # Remove operators and parentheses
-        cleaned = self.normalized
-        for op in ['&', '|', '!', '^', '→', '≡', '↑', '↓', '(', ')', ' ']:
-            cleaned = cleaned.replace(op, ' ')
-        
-        # Extract unique variable names
-        variables = set()
-        for token in cleaned.split():
-            if token and token[0].isalpha():
-                variables.add(token)
-        
-        return sorted(list(variables))
+        return list(_variables_in(self.normalized))
     
     def evaluate(self, values: Dict[str, bool]) -> bool:
         """Evaluate expression with given variable values."""
-        expr = self.normalized
+        if self._code is None:
+            raise ValueError(f"Error evaluating expression: {self._error}")
+        
+        try:
+            env = {name: bool(values[var]) for var, name in self._names.items()}
+            return bool(eval(self._code, {'__builtins__': {}}, env))
+        except Exception as e:
+            raise ValueError(f"Error evaluating expression: {e}")
+    
+    def evaluate_packed(self) -> Optional[int]:
+        """
+        Evaluate all 2^n variable assignments at once.
         
-        # Replace variables with their values
-        for var, val in values.items():
-            # Use word boundaries to avoid partial replacements
-            expr = re.sub(r'\b' + re.escape(var) + r'\b', 
-                         'True' if val else 'False', expr)
+        Each variable becomes an integer whose bit r is its value in truth
+        table row r (first variable most significant, as in product()), so
+        every operator is one bitwise operation over the whole column.
         
-        # Replace operators with Python equivalents
-        expr = expr.replace('&', ' and ')
-        expr = expr.replace('|', ' or ')
-        expr = expr.replace('!', ' not ')
-        expr = expr.replace('^', ' != ')  # XOR as inequality
+        Returns:
+            The output column as an integer, or None if the expression could
+            not be parsed.
+        """
+        n = len(self.variables)
+        num_rows = 1 << n
+        full = (1 << num_rows) - 1
         
-        # Handle implication: A→B = !A|B
-        while '→' in expr:
-            # Find implication
-            match = re.search(r'(\w+|True|False)\s*→\s*(\w+|True|False)', expr)
-            if match:
-                a, b = match.groups()
-                replacement = f'(not {a} or {b})'
-                expr = expr[:match.start()] + replacement + expr[match.end():]
-            else:
-                break
+        if self._source is None:
+            return None
         
-        # Handle equivalence: A≡B = (A&B)|(!A&!B)
-        while '≡' in expr:
-            match = re.search(r'(\w+|True|False)\s*≡\s*(\w+|True|False)', expr)
-            if match:
-                a, b = match.groups()
-                replacement = f'(({a} and {b}) or (not {a} and not {b}))'
-                expr = expr[:match.start()] + replacement + expr[match.end():]
-            else:
-                break
+        columns = {}
+        for j in range(n):
+            half = 1 << (n - 1 - j)
+            # Runs of `half` zeros then `half` ones, repeated over all rows
+            columns[f"_v{j}"] = (((1 << half) - 1) << half) * (full // ((1 << (2 * half)) - 1))
         
-        # Handle NAND: A↑B = !(A&B)
-        while '↑' in expr:
-            match = re.search(r'(\w+|True|False)\s*↑\s*(\w+|True|False)', expr)
-            if match:
-                a, b = match.groups()
-                replacement = f'not ({a} and {b})'
-                expr = expr[:match.start()] + replacement + expr[match.end():]
+        try:
+            return _eval_packed(ast.parse(self._source, mode='eval').body, columns, full)
+        except _Unsupported:
+            return None
+
+
+# Identifiers starting with a letter; operator words are already symbols
+# after normalization, so every match is a variable
+_IDENT_RE = re.compile(r'\b[^\W\d_]\w*')
+
+
+@lru_cache(maxsize=256)
+def _variables_in(normalized: str) -> Tuple[str, ...]:
+    """Sorted unique variable names of a normalized expression."""
+    return tuple(sorted(set(_IDENT_RE.findall(normalized))))
+
+
+# Binary operators of a normalized expression: (binding power, right associative).
+# NOT binds tightest, then AND, XOR, OR, implication and equivalence, as in FORMULA_GUIDE.md
+_BINARY_OPS = {
+    '&': (5, False), '↑': (5, False),
+    '^': (4, False),
+    '|': (3, False), '↓': (3, False),
+    '→': (2, True),
+    '≡': (1, False),
+}
+_CONSTANTS = {'0': False, '1': True}
+
+
+class _Parser:
+    """Pratt parser turning a normalized expression into nested tuples."""
+    
+    def __init__(self, expr: str):
+        self.tokens = self._tokenize(expr)
+        self.pos = 0
+    
+    @staticmethod
+    def _tokenize(expr: str) -> List[str]:
+        """Split into identifiers, constants, operators and parentheses in one pass."""
+        tokens = []
+        i, length = 0, len(expr)
+        while i < length:
+            char = expr[i]
+            if char.isspace():
+                i += 1
+            elif char.isalnum() or char == '_':
+                start = i
+                while i < length and (expr[i].isalnum() or expr[i] == '_'):
+                    i += 1
+                tokens.append(expr[start:i])
+            elif char in _BINARY_OPS or char in '!()':
+                tokens.append(char)
+                i += 1
             else:
+                raise ValueError(f"unexpected character {char!r}")
+        return tokens
+    
+    def parse(self) -> tuple:
+        """Parse the whole expression."""
+        node = self._expression(0)
+        if self.pos < len(self.tokens):
+            raise ValueError(f"unexpected {self.tokens[self.pos]!r}")
+        return node
+    
+    def _next(self) -> str:
+        if self.pos >= len(self.tokens):
+            raise ValueError("unexpected end of expression")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+    
+    def _expression(self, min_power: int) -> tuple:
+        left = self._operand()
+        while self.pos < len(self.tokens) and self.tokens[self.pos] in _BINARY_OPS:
+            op = self.tokens[self.pos]
+            power, right_assoc = _BINARY_OPS[op]
+            if power < min_power:
                 break
-        
-        # Handle NOR: A↓B = !(A|B)
-        while '↓' in expr:
-            match = re.search(r'(\w+|True|False)\s*↓\s*(\w+|True|False)', expr)
-            if match:
-                a, b = match.groups()
-                replacement = f'not ({a} or {b})'
-                expr = expr[:match.start()] + replacement + expr[match.end():]
+            self.pos += 1
+            right = self._expression(power if right_assoc else power + 1)
+            # Keep chains of one associative operator flat
+            if op in '&|^' and left[0] == op:
+                left = left + (right,)
             else:
-                break
-        
-        try:
-            return bool(eval(expr))
-        except Exception as e:
-            raise ValueError(f"Error evaluating expression: {e}")
+                left = (op, left, right)
+        return left
+    
+    def _operand(self) -> tuple:
+        token = self._next()
+        if token == '!':
+            return ('!', self._operand())
+        if token == '(':
+            node = self._expression(0)
+            if self._next() != ')':
+                raise ValueError("expected ')'")
+            return node
+        if token in _CONSTANTS:
+            return ('const', _CONSTANTS[token])
+        if token[0].isalpha():
+            return ('var', token)
+        raise ValueError(f"unexpected {token!r}")
+
 
+def _to_source(node: tuple, names: Dict[str, str]) -> str:
+    """Python source for a parsed expression, fully parenthesised."""
+    kind = node[0]
+    if kind == 'var':
+        return names[node[1]]
+    if kind == 'const':
+        return repr(node[1])
+    
+    args = [_to_source(child, names) for child in node[1:]]
+    if kind == '!':
+        return f"(not {args[0]})"
+    if kind == '&':
+        return "(" + " and ".join(args) + ")"
+    if kind == '|':
+        return "(" + " or ".join(args) + ")"
+    if kind == '^':
+        return "(" + " ^ ".join(args) + ")"
+    if kind == '↑':
+        return f"(not ({args[0]} and {args[1]}))"
+    if kind == '↓':
+        return f"(not ({args[0]} or {args[1]}))"
+    if kind == '→':
+        return f"((not {args[0]}) or {args[1]})"
+    return f"({args[0]} == {args[1]})"
 
+
+class _Unsupported(Exception):
+    """Raised for constructs the packed evaluator does not model."""
+
+
+def _eval_packed(node: ast.AST, columns: Dict[str, int], full: int) -> int:
+    """Evaluate a Python expression tree over bit columns with the semantics of eval() per row."""
+    if isinstance(node, ast.BoolOp):
+        values = [_eval_packed(value, columns, full) for value in node.values]
+        result = values[0]
+        for value in values[1:]:
+            result = result & value if isinstance(node.op, ast.And) else result | value
+        return result
+    
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return full ^ _eval_packed(node.operand, columns, full)
+    
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitXor):
+        return _eval_packed(node.left, columns, full) ^ _eval_packed(node.right, columns, full)
+    
+    if isinstance(node, ast.Compare) and len(node.ops) == 1 and isinstance(node.ops[0], ast.Eq):
+        return full ^ _eval_packed(node.left, columns, full) ^ _eval_packed(node.comparators[0], columns, full)
+    
+    if isinstance(node, ast.Name) and node.id in columns:
+        return columns[node.id]
+    
+    if isinstance(node, ast.Constant) and node.value in (0, 1) and not isinstance(node.value, float):
+        return full if node.value else 0
+    
+    raise _Unsupported(ast.dump(node))
+
+
+@lru_cache(maxsize=256)
 def generate_truth_table(expression: str) -> TruthTable:
     """
     Generate truth table for a boolean expression.
@@ -182,7 +333,8 @@ def generate_truth_table(expression: str) -> TruthTable:
         expression: Boolean expression (e.g., "A&B|~C")
     
     Returns:
-        TruthTable object
+        TruthTable object, cached by expression and shared between callers,
+        so it must not be modified
     """
     bool_expr = BooleanExpression(expression)
     variables = bool_expr.variables
@@ -190,17 +342,38 @@ def generate_truth_table(expression: str) -> TruthTable:
     if not variables:
         raise ValueError("No variables found in expression")
     
-    rows = []
+    num_rows = 1 << len(variables)
+    names = tuple(variables)
+    
+    # All rows in one bit-parallel pass where possible; bit r is row r
+    packed = bool_expr.evaluate_packed()
+    if packed is None:
+        rows = []
+        for mask, combination in enumerate(product([False, True], repeat=len(variables))):
+            output = bool_expr.evaluate(dict(zip(variables, combination)))
+            rows.append(TruthTableRow(mask, output, names))
+        return TruthTable(variables, rows)
     
-    # Generate all possible combinations
-    for combination in product([False, True], repeat=len(variables)):
-        values = dict(zip(variables, combination))
-        output = bool_expr.evaluate(values)
-        rows.append(TruthTableRow(values, output))
+    # Unpack the column little-endian, so element r is row r
+    column = np.frombuffer(packed.to_bytes((num_rows + 7) // 8, 'little'), dtype=np.uint8)
+    outputs = np.unpackbits(column, count=num_rows, bitorder='little').astype(bool).tolist()
     
+    rows = [TruthTableRow(mask, output, names) for mask, output in enumerate(outputs)]
     return TruthTable(variables, rows)
 
 
+def _per_table(func):
+    """Compute a normal form once per TruthTable and reuse it on later calls."""
+    @wraps(func)
+    def wrapper(truth_table: TruthTable) -> str:
+        forms = truth_table._forms
+        if func.__name__ not in forms:
+            forms[func.__name__] = func(truth_table)
+        return forms[func.__name__]
+    return wrapper
+
+
+@_per_table
 def calculate_pdnf(truth_table: TruthTable) -> str:
     """
     Calculate Perfect Disjunctive Normal Form (PDNF/СДНФ).
@@ -216,20 +389,20 @@ def calculate_pdnf(truth_table: TruthTable) -> str:
     if not minterms:
         return "0"  # Function is always false
     
+    # Literal for each variable when its bit is 0 and when it is 1
+    n = len(truth_table.variables)
+    literals = [(f"!{var}", var, n - 1 - j) for j, var in enumerate(truth_table.variables)]
+    
     terms = []
     for row in minterms:
         # Create conjunction for this row
-        literals = []
-        for var in truth_table.variables:
-            if row.inputs[var]:
-                literals.append(var)
-            else:
-                literals.append(f"!{var}")
-        terms.append("(" + "&".join(literals) + ")")
+        mask = row.mask
+        terms.append("(" + "&".join(one if mask >> shift & 1 else zero for zero, one, shift in literals) + ")")
     
     return " | ".join(terms)
 
 
+@_per_table
 def calculate_pcnf(truth_table: TruthTable) -> str:
     """
     Calculate Perfect Conjunctive Normal Form (PCNF/СКНФ).
@@ -245,23 +418,39 @@ def calculate_pcnf(truth_table: TruthTable) -> str:
     if not maxterms:
         return "1"  # Function is always true
     
+    # Literal for each variable when its bit is 0 and when it is 1
+    n = len(truth_table.variables)
+    literals = [(var, f"!{var}", n - 1 - j) for j, var in enumerate(truth_table.variables)]
+    
     terms = []
     for row in maxterms:
         # Create disjunction for this row
-        literals = []
-        for var in truth_table.variables:
-            if row.inputs[var]:
-                literals.append(f"!{var}")
-            else:
-                literals.append(var)
-        terms.append("(" + "|".join(literals) + ")")
+        mask = row.mask
+        terms.append("(" + "|".join(one if mask >> shift & 1 else zero for zero, one, shift in literals) + ")")
     
     return " & ".join(terms)
 
 
+def _anf_inplace(a: np.ndarray) -> None:
+    """Möbius transform of a truth table column, one bit position per pass."""
+    size = a.shape[0]
+    step = 1
+    while step < size:
+        for i in range(0, size, 2 * step):
+            for j in range(i, i + step):
+                a[j + step] ^= a[j]
+        step *= 2
+
+
+# Below this many variables the NumPy passes beat the JIT warmup
+_ANF_NATIVE_MIN_VARIABLES = 12
+_anf_native = njit(cache=True)(_anf_inplace) if njit is not None else None
+
+
+@_per_table
 def calculate_zhegalkin(truth_table: TruthTable) -> str:
     """
-    Calculate Zhegalkin polynomial (ANF) using triangle method.
+    Calculate Zhegalkin polynomial (ANF) with the in-place Möbius transform.
     
     Args:
         truth_table: Truth table to convert
@@ -269,43 +458,94 @@ def calculate_zhegalkin(truth_table: TruthTable) -> str:
     Returns:
         Zhegalkin polynomial as string
     """
-    # Get output column
-    outputs = [int(row.output) for row in truth_table.rows]
     n = len(truth_table.variables)
+    coefficients = np.array([row.output for row in truth_table.rows], dtype=np.uint8)
+    
+    # After the pass for bit b, every row with bit b set has been XORed with
+    # its partner without it; after all n passes entry i is the coefficient
+    # of the monomial of the variables whose bits are set in i
+    if _anf_native is not None and n >= _ANF_NATIVE_MIN_VARIABLES:
+        _anf_native(coefficients)
+    else:
+        for b in range(n):
+            step = 1 << b
+            pairs = coefficients.reshape(-1, 2, step)
+            pairs[:, 1, :] ^= pairs[:, 0, :]
+    
+    # Row bit n-1-j belongs to variable j (first variable most significant);
+    # list monomials by degree, then in variable order
+    monomials = sorted(np.flatnonzero(coefficients).tolist(), key=lambda i: (i.bit_count(), -i))
+    if not monomials:
+        return "0"
     
-    # Build triangle
-    triangle = [outputs]
-    for i in range(n):
-        new_row = []
-        prev_row = triangle[-1]
-        for j in range(len(prev_row) - 1):
-            new_row.append((prev_row[j] + prev_row[j + 1]) % 2)
-        triangle.append(new_row)
+    bits = [(1 << (n - 1 - j), var) for j, var in enumerate(truth_table.variables)]
+    terms = ["&".join([var for bit, var in bits if i & bit]) or "1" for i in monomials]
     
-    # Extract coefficients (diagonal)
-    coefficients = [triangle[i][0] for i in range(len(triangle))]
+    return " ⊕ ".join(terms)
+
+
+def minimize_sop(truth_table: TruthTable) -> List[List[Tuple[str, bool]]]:
+    """
+    Minimal sum of products for a truth table (Quine–McCluskey).
     
-    # Build polynomial
-    terms = []
-    for i, coef in enumerate(coefficients):
-        if coef == 1:
-            if i == 0:
-                terms.append("1")
-            else:
-                # Determine which variables to include
-                var_indices = []
-                for j in range(n):
-                    if (i >> j) & 1:
-                        var_indices.append(j)
-                
-                if var_indices:
-                    var_term = "&".join([truth_table.variables[j] for j in var_indices])
-                    terms.append(var_term)
-    
-    if not terms:
-        return "0"
+    Args:
+        truth_table: Truth table to minimize
     
-    return " ⊕ ".join(terms)
+    Returns:
+        Implicants as lists of (variable, is_positive) literals
+    """
+    minterms = [i for i, row in enumerate(truth_table.rows) if row.output]
+    return minimize_minterms(minterms, truth_table.variables)
+
+
+def minimize_minterms(minterms, variables: List[str]) -> List[List[Tuple[str, bool]]]:
+    """
+    Minimal sum of products covering the given minterms.
+    
+    Minterm bit n-1-j is the value of variables[j], as in truth table rows.
+    Prime implicants come from merging implicants that differ in one bit;
+    essential ones are taken first, then the one covering the most
+    remaining minterms until all are covered.
+    
+    Returns:
+        Implicants as lists of (variable, is_positive) literals; a constant
+        true function gives one empty implicant, a constant false one none
+    """
+    n = len(variables)
+    minterms = set(minterms)
+    
+    # Implicants are (value, mask) pairs; mask bits are the eliminated variables
+    current = {(m, 0) for m in minterms}
+    primes = set()
+    while current:
+        merged = set()
+        combined = set()
+        for value, mask in current:
+            for b in range(n):
+                bit = 1 << b
+                if not (value | mask) & bit and (value | bit, mask) in current:
+                    merged.add((value, mask | bit))
+                    combined.add((value, mask))
+                    combined.add((value | bit, mask))
+        primes |= current - combined
+        current = merged
+    
+    covers = {prime: {m for m in minterms if m & ~prime[1] == prime[0]} for prime in primes}
+    chosen = []
+    uncovered = set(minterms)
+    for m in sorted(minterms):
+        owners = [prime for prime in primes if m in covers[prime]]
+        if len(owners) == 1 and owners[0] not in chosen:
+            chosen.append(owners[0])
+            uncovered -= covers[owners[0]]
+    while uncovered:
+        best = max(primes, key=lambda prime: (len(covers[prime] & uncovered), bin(prime[1]).count('1'), -prime[0]))
+        chosen.append(best)
+        uncovered -= covers[best]
+    
+    return [[(var, bool(value >> (n - 1 - j) & 1)) for j, var in enumerate(variables)
+             if not mask >> (n - 1 - j) & 1]
+            for value, mask in chosen]
 
 
 # Convenience function for quick testing
@@ -317,8 +557,16 @@ def analyze_boolean_function(expression: str) -> Dict:
         expression: Boolean expression
     
     Returns:
-        Dictionary with truth table, PDNF, PCNF, and Zhegalkin polynomial
+        Dictionary with truth table, PDNF, PCNF, and Zhegalkin polynomial.
+        Results are cached by expression text (runs of whitespace ignored)
+        and shared between callers, so they must not be modified.
     """
+    return _analyze_cached(" ".join(expression.split()))
+
+
+@lru_cache(maxsize=128)
+def _analyze_cached(expression: str) -> Dict:
+    """Analyze a whitespace-normalized expression (see analyze_boolean_function)."""
     truth_table = generate_truth_table(expression)
     
     return {
@@ -2,12 +2,12 @@
 Circuit builder from boolean forms (PDNF/PCNF) using bracket grouping algorithm.
 Based on the flowchart algorithm for efficient circuit construction.
 """
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, FrozenSet
 from circuit_model import Circuit, Wire
 from components.registry import ComponentRegistry
 from utils.geometry import Point
-from utils.boolean_algebra import TruthTable, calculate_pdnf, calculate_pcnf
-import re
+from utils.boolean_algebra import TruthTable, calculate_pdnf, calculate_pcnf, minimize_minterms
+from utils.constants import CALC_MINIMIZE_MAX_VARIABLES
 
 
 class CircuitFromBooleanForm:
@@ -20,6 +20,13 @@ class CircuitFromBooleanForm:
         self.current_y = 80
         self.spacing_x = 150  # Increased horizontal spacing
         self.spacing_y = 100  # Increased vertical spacing
+        # Row for the next term's gates, and gates already built by
+        # (kind, literal set), shared between terms
+        self._next_row_y = self.current_y
+        self._gate_cache: Dict[Tuple[str, FrozenSet], object] = {}
+        # Component classes resolved once instead of per created component
+        self._ctor = {name: ComponentRegistry.get_class(name)
+                      for name in ('switch', 'not', 'and', 'or', 'led')}
     
     def build_from_pdnf(self, pdnf: str, variables: List[str]) -> bool:
         """
@@ -28,9 +35,9 @@ class CircuitFromBooleanForm:
         Algorithm (from flowchart):
         1. Create input switches for each variable
         2. Create NOT gates for negated variables
-        3. Group terms by brackets (скобки)
-        4. For each bracket: create AND gate
-        5. Final AND gate combines all brackets
+        3. Group terms by brackets (скобки), merged into minimal implicants
+        4. For each bracket: create a tree of 2-input AND gates (single literals are wired directly)
+        5. Final OR gate combines all brackets
         
         Args:
             pdnf: PDNF expression like "(!A&B) | (A&!B)"
@@ -46,6 +53,8 @@ class CircuitFromBooleanForm:
             if not terms:
                 return False
             
+            terms = self._minimize_terms(terms, variables)
+            
             # Step 1: Create input switches
             input_switches = self._create_input_switches(variables)
             
@@ -82,7 +91,8 @@ class CircuitFromBooleanForm:
         """
         Build circuit from PCNF (Perfect Conjunctive Normal Form).
         
-        Similar to PDNF but with OR gates for terms and final AND gate.
+        Similar to PDNF but with OR gates for terms and final AND gate; the
+        clauses are minimized the same way, into a minimal product of sums.
         
         Args:
             pcnf: PCNF expression like "(A|B) & (A|!B)"
@@ -98,6 +108,13 @@ class CircuitFromBooleanForm:
             if not clauses:
                 return False
             
+            # A clause is false on the rows of the product of its negated
+            # literals: minimize those rows and negate the implicants back
+            clauses = [[(var, not is_positive) for var, is_positive in term]
+                       for term in self._minimize_terms(
+                           [[(var, not is_positive) for var, is_positive in clause]
+                            for clause in clauses], variables)]
+            
             # Create input switches
             input_switches = self._create_input_switches(variables)
             
@@ -136,33 +153,49 @@ class CircuitFromBooleanForm:
         
         Example: "(!A&B) | (A&!B)" -> [[('A', False), ('B', True)], [('A', True), ('B', False)]]
         """
-        terms = []
-        
-        # Split by OR (|)
-        term_strings = re.split(r'\s*\|\s*', dnf)
+        return self._tokenize_form(dnf, '|', '&')
+    
+    def _minimize_terms(self, terms: List[List[Tuple[str, bool]]],
+                        variables: List[str]) -> List[List[Tuple[str, bool]]]:
+        """
+        Merge DNF terms into minimal implicants (Quine–McCluskey).
         
-        for term_str in term_strings:
-            # Remove parentheses
-            term_str = term_str.strip().strip('()')
-            
-            # Split by AND (&)
-            literals = re.split(r'\s*&\s*', term_str)
-            
-            term = []
-            for lit in literals:
-                lit = lit.strip()
-                if lit.startswith('!') or lit.startswith('~') or lit.startswith('¬'):
-                    # Negated variable
-                    var = lit[1:].strip()
-                    term.append((var, False))
+        Functions of more than CALC_MINIMIZE_MAX_VARIABLES variables keep
+        their terms, as the minimization time grows steeply with width; so
+        does a constant true function, which has no literals left.
+        """
+        if len(variables) > CALC_MINIMIZE_MAX_VARIABLES:
+            return terms
+        implicants = minimize_minterms(self._terms_to_minterms(terms, variables), variables)
+        return implicants if all(implicants) else terms
+    
+    def _terms_to_minterms(self, terms: List[List[Tuple[str, bool]]],
+                           variables: List[str]) -> Set[int]:
+        """Indices of the truth table rows covered by DNF terms."""
+        n = len(variables)
+        bits = {var: 1 << (n - 1 - j) for j, var in enumerate(variables)}
+        full = (1 << n) - 1
+        
+        minterms = set()
+        for term in terms:
+            positive = negative = 0
+            for var, is_positive in term:
+                if is_positive:
+                    positive |= bits[var]
                 else:
-                    # Positive variable
-                    term.append((lit, True))
-            
-            if term:
-                terms.append(term)
-        
-        return terms
+                    negative |= bits[var]
+            if positive & negative:
+                continue  # A&!A covers no rows
+            # Walk the subsets of the free bits; a full minterm has none
+            free = full & ~(positive | negative)
+            sub = free
+            while True:
+                minterms.add(positive | sub)
+                if not sub:
+                    break
+                sub = (sub - 1) & free
+        
+        return minterms
     
     def _parse_cnf_clauses(self, cnf: str) -> List[List[Tuple[str, bool]]]:
         """
@@ -170,45 +203,44 @@ class CircuitFromBooleanForm:
         
         Example: "(A|B) & (A|!B)" -> [[('A', True), ('B', True)], [('A', True), ('B', False)]]
         """
-        clauses = []
-        
-        # Split by AND (&)
-        clause_strings = re.split(r'\s*&\s*', cnf)
-        
-        for clause_str in clause_strings:
-            # Remove parentheses
-            clause_str = clause_str.strip().strip('()')
-            
-            # Split by OR (|)
-            literals = re.split(r'\s*\|\s*', clause_str)
-            
-            clause = []
-            for lit in literals:
-                lit = lit.strip()
-                if lit.startswith('!') or lit.startswith('~') or lit.startswith('¬'):
-                    # Negated variable
-                    var = lit[1:].strip()
-                    clause.append((var, False))
-                else:
-                    # Positive variable
-                    clause.append((lit, True))
-            
-            if clause:
-                clauses.append(clause)
-        
-        return clauses
+        return self._tokenize_form(cnf, '&', '|')
+    
+    def _tokenize_form(self, form: str, outer: str, inner: str) -> List[List[Tuple[str, bool]]]:
+        """Split a normal form into groups of (variable, is_positive) literals in one pass."""
+        groups = []
+        group = []
+        name = []
+        is_positive = True
+        
+        # A trailing delimiter flushes the last literal and group
+        for char in form + outer:
+            if char == outer or char == inner:
+                if name:
+                    group.append(("".join(name), is_positive))
+                name = []
+                is_positive = True
+                if char == outer:
+                    if group:
+                        groups.append(group)
+                    group = []
+            elif char in '!~¬':
+                is_positive = False
+            elif char not in '()' and not char.isspace():
+                name.append(char)
+        
+        return groups
     
     def _create_input_switches(self, variables: List[str]) -> Dict:
         """Create input switches for each variable."""
         switches = {}
+        make_switch, add = self._ctor["switch"], self.circuit.add_component
         
         for i, var in enumerate(variables):
-            switch = ComponentRegistry.create(
-                "switch",
+            switch = make_switch(
                 label=var,
                 position=Point(self.current_x, self.current_y + i * self.spacing_y)
             )
-            self.circuit.add_component(switch)
+            add(switch)
             switches[var] = switch
         
         return switches
@@ -216,17 +248,17 @@ class CircuitFromBooleanForm:
     def _create_not_gates(self, variables: List[str], input_switches: Dict) -> Dict:
         """Create NOT gates for each input."""
         not_gates = {}
+        make_not, add = self._ctor["not"], self.circuit.add_component
         
         for i, var in enumerate(variables):
-            not_gate = ComponentRegistry.create(
-                "not",
+            not_gate = make_not(
                 label=f"NOT_{var}",
                 position=Point(
                     self.current_x + self.spacing_x,
                     self.current_y + i * self.spacing_y
                 )
             )
-            self.circuit.add_component(not_gate)
+            add(not_gate)
             
             # Wire from switch to NOT
             switch_pin = input_switches[var].get_pin("out")
@@ -245,133 +277,85 @@ class CircuitFromBooleanForm:
                              input_switches: Dict,
                              not_gates: Dict,
                              term_index: int):
-        """Create AND gate for a DNF term (bracket)."""
-        
-        # Calculate Y position with proper spacing
-        y_pos = self.current_y + (term_index * self.spacing_y)
+        """Create AND gates for a DNF term (bracket) as a balanced tree of 2-input gates."""
         
-        # Create AND gate
-        and_gate = ComponentRegistry.create(
-            "and",
-            label=f"AND{term_index + 1}",
-            position=Point(
-                self.current_x + 2 * self.spacing_x,
-                y_pos
-            )
-        )
-        self.circuit.add_component(and_gate)
-        
-        # Wire inputs to AND gate
-        for i, (var, is_positive) in enumerate(term):
-            if i >= 2:  # AND gates typically have 2 inputs
-                break
-            
-            source_component = input_switches[var] if is_positive else not_gates[var]
-            source_pin = source_component.get_pin("out")
-            dest_pin = and_gate.get_pin(f"in{i}")
-            
-            if source_pin and dest_pin:
-                wire = Wire("", source_pin, dest_pin)
-                self.circuit.add_wire(wire)
+        nodes = [(frozenset([literal]), input_switches[literal[0]] if literal[1] else not_gates[literal[0]])
+                 for literal in term]
+        return self._reduce_tree("and", nodes, self.current_x + 2 * self.spacing_x, new_rows=True)
+    
+    def _reduce_tree(self, kind: str, nodes: List[Tuple[FrozenSet, object]], x: float,
+                     new_rows: bool = False):
+        """
+        Combine node outputs pairwise, level by level, with 2-input gates.
         
-        return and_gate
+        Each node is (literal set, component). A gate over the same literal set
+        is built once and reused by later terms (structural hashing); nodes
+        without a literal set are never shared. With new_rows the first level
+        takes the next free rows; other gates sit between their inputs.
+        """
+        level = 0
+        while len(nodes) > 1:
+            combined = []
+            for (left_key, left), (right_key, right) in zip(nodes[0::2], nodes[1::2]):
+                key = None
+                if left_key is not None and right_key is not None:
+                    key = (kind, left_key | right_key)
+                gate = self._gate_cache.get(key)
+                if gate is None:
+                    if new_rows and level == 0:
+                        y = self._next_row_y
+                        self._next_row_y += self.spacing_y
+                    else:
+                        y = (left.position.y + right.position.y) / 2
+                    self.component_counter += 1
+                    gate = self._ctor[kind](
+                        label=f"{kind.upper()}{self.component_counter}",
+                        position=Point(x + level * self.spacing_x, y)
+                    )
+                    self.circuit.add_component(gate)
+                    self.circuit.add_wire(Wire("", left.get_pin("out"), gate.input_pin(0)))
+                    self.circuit.add_wire(Wire("", right.get_pin("out"), gate.input_pin(1)))
+                    if key is not None:
+                        self._gate_cache[key] = gate
+                combined.append((key[1] if key else None, gate))
+            if len(nodes) % 2:
+                combined.append(nodes[-1])
+            nodes = combined
+            level += 1
+        
+        return nodes[0][1]
     
     def _create_clause_or_gate(self, clause: List[Tuple[str, bool]],
                                variables: List[str],
                                input_switches: Dict,
                                not_gates: Dict,
                                clause_index: int):
-        """Create OR gate for a CNF clause."""
-        
-        # Create OR gate
-        or_gate = ComponentRegistry.create(
-            "or",
-            label=f"OR{clause_index + 1}",
-            position=Point(
-                self.current_x + 2 * self.spacing_x,
-                self.current_y + clause_index * self.spacing_y
-            )
-        )
-        self.circuit.add_component(or_gate)
-        
-        # Wire inputs to OR gate
-        for i, (var, is_positive) in enumerate(clause):
-            if i >= 2:  # OR gates typically have 2 inputs
-                break
-            
-            source_component = input_switches[var] if is_positive else not_gates[var]
-            source_pin = source_component.get_pin("out")
-            dest_pin = or_gate.get_pin(f"in{i}")
-            
-            wire = Wire("", source_pin, dest_pin)
-            self.circuit.add_wire(wire)
-        
-        return or_gate
+        """Create OR gates for a CNF clause as a balanced tree of 2-input gates."""
+        nodes = [(frozenset([literal]), input_switches[literal[0]] if literal[1] else not_gates[literal[0]])
+                 for literal in clause]
+        return self._reduce_tree("or", nodes, self.current_x + 2 * self.spacing_x, new_rows=True)
     
     def _create_final_or_gate(self, and_gates: List) -> object:
-        """Create final OR gate combining all AND gates."""
-        
-        # Calculate center Y position based on number of AND gates
-        if len(and_gates) > 0:
-            first_gate_y = and_gates[0].position.y
-            last_gate_y = and_gates[-1].position.y if len(and_gates) > 1 else first_gate_y
-            center_y = (first_gate_y + last_gate_y) / 2
-        else:
-            center_y = self.current_y
-        
-        final_or = ComponentRegistry.create(
-            "or",
-            label="OR_FINAL",
-            position=Point(
-                self.current_x + 3 * self.spacing_x,
-                center_y
-            )
-        )
-        self.circuit.add_component(final_or)
-        
-        # Wire AND gates to final OR
-        for i, and_gate in enumerate(and_gates[:2]):  # Limit to 2 inputs
-            wire = Wire(
-                "",
-                and_gate.get_pin("out"),
-                final_or.get_pin(f"in{i}")
-            )
-            self.circuit.add_wire(wire)
-        
+        """Create final OR gates combining all AND gates."""
+        final_or = self._reduce_tree("or", [(None, gate) for gate in and_gates],
+                                     max(gate.position.x for gate in and_gates) + self.spacing_x)
+        final_or.label = "OR_FINAL"
         return final_or
     
     def _create_final_and_gate(self, or_gates: List) -> object:
-        """Create final AND gate combining all OR gates."""
-        
-        final_and = ComponentRegistry.create(
-            "and",
-            label="AND_FINAL",
-            position=Point(
-                self.current_x + 3 * self.spacing_x,
-                self.current_y + len(or_gates) * self.spacing_y // 2
-            )
-        )
-        self.circuit.add_component(final_and)
-        
-        # Wire OR gates to final AND
-        for i, or_gate in enumerate(or_gates[:2]):  # Limit to 2 inputs
-            wire = Wire(
-                "",
-                or_gate.get_pin("out"),
-                final_and.get_pin(f"in{i}")
-            )
-            self.circuit.add_wire(wire)
-        
+        """Create final AND gates combining all OR gates."""
+        final_and = self._reduce_tree("and", [(None, gate) for gate in or_gates],
+                                      max(gate.position.x for gate in or_gates) + self.spacing_x)
+        final_and.label = "AND_FINAL"
         return final_and
     
     def _create_output_led(self, final_gate) -> None:
         """Create output LED."""
         
-        led = ComponentRegistry.create(
-            "led",
+        led = self._ctor["led"](
             label="Output",
             position=Point(
-                self.current_x + 4 * self.spacing_x,
+                final_gate.position.x + self.spacing_x,
                 final_gate.position.y
             )
         )
@@ -36,11 +36,19 @@ WIRE_HIT_TOLERANCE = 5
 CANVAS_MIN_ZOOM = 0.25
 CANVAS_MAX_ZOOM = 4.0
 CANVAS_ZOOM_STEP = 0.1
+CANVAS_INDEX_CELL_SIZE = 80  # Side of a hit-test bucket, in world units
+CANVAS_DETAIL_MIN_ZOOM = 0.6  # Below this zoom components lose outline and label
 
 # Simulation
 SIM_TICK_RATE_MS = 100  # milliseconds per tick
+SIM_MAX_FPS = 30  # Redraw limit while the simulation runs continuously
 SIM_MAX_PROPAGATION_DEPTH = 1000
 
+# Calculator
+TRUTH_TABLE_PAGE_ROWS = 256  # Truth table rows shown at once
+CALC_INPUT_UPDATE_DELAY_MS = 16  # Operator clicks within this window share one update
+CALC_MINIMIZE_MAX_VARIABLES = 8  # Wider functions are built from their plain normal form
+
 # Signal states
 SIGNAL_LOW = 0
 SIGNAL_HIGH = 1
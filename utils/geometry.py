@@ -1,13 +1,16 @@
 """
 Geometry utilities for circuit layout and wire routing.
 """
-from typing import Tuple, List
+from typing import Dict, Tuple, List
 import math
+import numpy as np
 
 
 class Point:
     """Represents a 2D point."""
     
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -27,6 +30,10 @@ class Point:
         """Calculate Euclidean distance to another point."""
         return math.sqrt((self.x - other.x) ** 2 + (self.y - other.y) ** 2)
     
+    def distance_to_sq(self, other: 'Point') -> float:
+        """Squared Euclidean distance; enough for comparing distances."""
+        return (self.x - other.x) ** 2 + (self.y - other.y) ** 2
+    
     def to_tuple(self) -> Tuple[float, float]:
         """Convert to tuple."""
         return (self.x, self.y)
@@ -37,9 +44,16 @@ class Point:
         return Point(t[0], t[1])
 
 
+# Default position for components created without one. Points are treated
+# as values (replaced, never modified in place), so one instance is shared.
+ORIGIN = Point(0, 0)
+
+
 class Rect:
     """Represents a rectangle."""
     
+    __slots__ = ('x', 'y', 'width', 'height')
+    
     def __init__(self, x: float, y: float, width: float, height: float):
         self.x = x
         self.y = y
@@ -63,57 +77,123 @@ class Rect:
         return Point(self.x + self.width / 2, self.y + self.height / 2)
 
 
+class SpatialIndex:
+    """
+    Uniform grid of buckets over axis-aligned rectangles, for point queries.
+    
+    Each item is stored in every cell its rectangle overlaps, so a query only
+    looks at the one cell under the point. Items come back in insertion order.
+    """
+    
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[tuple]] = {}
+    
+    def insert(self, item, x: float, y: float, width: float, height: float):
+        """Add an item covering the rectangle (x, y, width, height)."""
+        size = self.cell_size
+        entry = (item, x, y, x + width, y + height)
+        for cx in range(math.floor(x / size), math.floor((x + width) / size) + 1):
+            for cy in range(math.floor(y / size), math.floor((y + height) / size) + 1):
+                self._cells.setdefault((cx, cy), []).append(entry)
+    
+    def query_point(self, x: float, y: float) -> list:
+        """Items whose rectangle contains the point."""
+        size = self.cell_size
+        bucket = self._cells.get((math.floor(x / size), math.floor(y / size)))
+        if not bucket:
+            return []
+        return [item for item, left, top, right, bottom in bucket
+                if left <= x <= right and top <= y <= bottom]
+
+
 def snap_to_grid(x: float, y: float, grid_size: int) -> Tuple[float, float]:
     """Snap coordinates to grid."""
     return (round(x / grid_size) * grid_size,
             round(y / grid_size) * grid_size)
 
 
+def snap_to_grid_arr(xy: np.ndarray, grid_size: int) -> np.ndarray:
+    """Snap an (n, 2) array of coordinates to grid, rounding like snap_to_grid."""
+    return np.round(np.asarray(xy) / grid_size) * grid_size
+
+
 def manhattan_distance(p1: Point, p2: Point) -> float:
     """Calculate Manhattan distance between two points."""
     return abs(p1.x - p2.x) + abs(p1.y - p2.y)
 
 
-def route_wire(start: Point, end: Point) -> List[Point]:
+def manhattan_distance_arr(p1s: np.ndarray, p2s: np.ndarray) -> np.ndarray:
+    """Manhattan distances between matching rows of two (n, 2) coordinate arrays."""
+    return np.abs(np.asarray(p1s) - np.asarray(p2s)).sum(axis=1)
+
+
+def route_wire(start: Point, end: Point) -> Tuple[Point, ...]:
     """
     Route a wire between two points using Manhattan routing.
-    Returns list of points forming the wire path.
+    Returns tuple of points forming the wire path.
+    """
+    if abs(start.y - end.y) < 5 or abs(start.x - end.x) < 5:
+        # Horizontal or vertical line
+        return (start, end)
+    
+    # L-shape with midpoint
+    mid_x = (start.x + end.x) * 0.5
+    return (start, Point(mid_x, start.y), Point(mid_x, end.y), end)
+
+
+def route_wires_batch(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Route many wires at once, as route_wire does, from (k, 2) coordinate arrays.
+    
+    Returns a (k, 4, 2) array of paths; straight wires repeat their end
+    points so every path has four points.
     """
-    # Simple L-shaped routing
-    mid_x = (start.x + end.x) / 2
-    
-    if abs(start.y - end.y) < 5:
-        # Horizontal line
-        return [start, end]
-    elif abs(start.x - end.x) < 5:
-        # Vertical line
-        return [start, end]
-    else:
-        # L-shape with midpoint
-        return [
-            start,
-            Point(mid_x, start.y),
-            Point(mid_x, end.y),
-            end
-        ]
+    starts = np.asarray(starts, dtype=float)
+    ends = np.asarray(ends, dtype=float)
+    paths = np.empty((len(starts), 4, 2))
+    paths[:, 0] = starts
+    paths[:, 3] = ends
+    
+    # L-shape bends at the middle column; straight wires bend in place
+    mid_x = (starts[:, 0] + ends[:, 0]) * 0.5
+    paths[:, 1, 0] = mid_x
+    paths[:, 1, 1] = starts[:, 1]
+    paths[:, 2, 0] = mid_x
+    paths[:, 2, 1] = ends[:, 1]
+    straight = (np.abs(starts - ends) < 5).any(axis=1)
+    paths[straight, 1] = starts[straight]
+    paths[straight, 2] = ends[straight]
+    return paths
 
 
 def point_to_line_distance(point: Point, line_start: Point, line_end: Point) -> float:
     """
     Calculate the shortest distance from a point to a line segment.
     """
+    return math.sqrt(point_to_line_distance_sq(point, line_start, line_end))
+
+
+def point_to_line_distance_sq(point: Point, line_start: Point, line_end: Point) -> float:
+    """
+    Squared shortest distance from a point to a line segment.
+    
+    Orders segments the same way as point_to_line_distance without the sqrt.
+    """
     # Vector from line_start to line_end
     dx = line_end.x - line_start.x
     dy = line_end.y - line_start.y
+    px = point.x - line_start.x
+    py = point.y - line_start.y
     
     if dx == 0 and dy == 0:
         # Line segment is actually a point
-        return point.distance_to(line_start)
+        return px * px + py * py
     
     # Parameter t of the projection of point onto the line
-    t = max(0, min(1, ((point.x - line_start.x) * dx + (point.y - line_start.y) * dy) / (dx * dx + dy * dy)))
-    
-    # Closest point on the line segment
-    closest = Point(line_start.x + t * dx, line_start.y + t * dy)
+    t = max(0, min(1, (px * dx + py * dy) / (dx * dx + dy * dy)))
     
-    return point.distance_to(closest)
+    # Offset from the closest point on the line segment
+    ox = px - t * dx
+    oy = py - t * dy
+    return ox * ox + oy * oy